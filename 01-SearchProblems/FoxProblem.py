@@ -10,7 +10,21 @@ __email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
 __github__ = "@siavava"
 
 
+def boat_moves(capacity):
+    """Build the table of loads the boat can carry across the river in one crossing.
+        :arg capacity: the maximum number of animals in the boat.
+        :return: a tuple of (chickens, foxes) pairs, each carrying between 1 and `capacity` animals.
+    """
+    return tuple((chickens, foxes)
+                 for chickens in range(0, capacity + 1)
+                 for foxes in range(0, capacity + 1 - chickens)
+                 if chickens + foxes >= 1)
+
+
 class FoxProblem:
+    # number of animals the boat can carry in one crossing.
+    boat_capacity = 2
+
     def __init__(self, start_state=(3, 3, 1)):
         self.start_state = start_state
         self.goal_state = (0, 0, 0)
@@ -19,75 +33,84 @@ class FoxProblem:
         self.total_foxes = start_state[1]
         self.boat_ashore = bool(start_state[2])
 
-        # you might want to add other things to the problem,
-        #  like the total number of chickens (which you can figure out
-        #  based on start_state
+        # precompute every load the boat can carry, so successor generation is a single pass over a table.
+        self.boat_moves = boat_moves(self.boat_capacity)
 
     # get successor states for the given state
     def get_successors(self, state):
-        # you write this part. I also had a helper function
-        #  that tested if states were safe before adding to successor list
-        next_states = set()
-        for num_chickens in range(0, 3):
-            for num_foxes in range(0, 3):
-                total = num_chickens + num_foxes
-                # print("total = ", total)
-                if 1 <= total <= 2:  # ignore states the empty transition
-
-                    if state[2] == 1:
-                        # BOAT LEAVING SHORE
-                        new_chickens = state[0] - num_chickens  # find new number of chicken ashore
-                        new_foxes = state[1] - num_foxes  # find new number of foxes ashore
-                        next_state = (new_chickens, new_foxes, 0)
-
-                        # check the state for validity, append to valid states
-                        if self.is_valid(next_state):
-                            # print("2", next_state)
-                            next_states.add(next_state)
-
-                    elif state[2] == 0:
-                        # BOAT RETURNING TO SHORE
-                        new_chickens = state[0] + num_chickens  # find new number of chicken ashore
-                        new_foxes = state[1] + num_foxes  # find new number of foxes ashore
-                        next_state = (new_chickens, new_foxes, 1)
-
-                        # check the state for validity, append to valid states
-                        if self.is_valid(next_state):
-                            next_states.add(next_state)
-        # return set of states
+        """Return a list of valid states reachable from `state` in one crossing.
+            :arg state: a (chickens, foxes, boat) tuple, counting the animals on the starting bank.
+        """
+        chickens, foxes, boat = state
+        total_chickens, total_foxes = self.total_chickens, self.total_foxes
+
+        # the boat takes animals away from the starting bank if it is there, and brings them back otherwise.
+        direction = -1 if boat == 1 else 1
+        next_boat = 1 - boat
+
+        next_states = []
+        for num_chickens, num_foxes in self.boat_moves:
+            new_chickens = chickens + direction * num_chickens
+            new_foxes = foxes + direction * num_foxes
+
+            # inline validity check: see `is_valid`.
+            if 0 <= new_chickens <= total_chickens and 0 <= new_foxes <= total_foxes \
+                    and (new_chickens == 0 or new_chickens >= new_foxes) \
+                    and (new_chickens == total_chickens
+                         or total_chickens - new_chickens >= total_foxes - new_foxes):
+                next_states.append((new_chickens, new_foxes, next_boat))
+
+        # return list of states
         return next_states
 
+    # get predecessor states for the given state
+    def get_predecessors(self, state):
+        """Return the set of valid states from which `state` can be reached in one crossing.
+            Every crossing can be undone by sending the same animals back in the boat,
+            so the predecessors of a valid state are exactly its (valid) successors.
+            An unsafe state cannot be entered at all, so it has no predecessors.
+            :arg state: a (chickens, foxes, boat) tuple.
+            :return: a list of predecessor states.
+        """
+        if not self.is_valid(state):
+            return []
+        return self.get_successors(state)
+
     # I also had a goal test method. You should write one.
     def is_goal(self, state):
         return self.goal_state == state
 
     def is_valid(self, state):
+        """Check that a state has no bank where foxes outnumber chickens (unless that bank has no chickens).
+            :arg state: a (chickens, foxes, boat) tuple, counting the animals on the starting bank.
+        """
+        chickens, foxes = state[0], state[1]
 
-        # A valid state cannot have negative chickens / foxes
-        if state[0] < 0 or state[1] < 0:
+        # 1, make sure the counts are within bounds of how many chickens and foxes are available.
+        if not (0 <= chickens <= self.total_chickens and 0 <= foxes <= self.total_foxes):
             return False
 
-        new_chicken_count = state[0]
-        chickens_side_B = self.total_chickens - new_chicken_count
-
-        new_fox_count = state[1]
-        foxes_side_B = self.total_foxes - new_fox_count
-
-        # 1, make sure proposed move is within bounds of how many chickens and foxes are available.
-        if new_chicken_count <= self.total_chickens and new_fox_count <= self.total_foxes:
-
-            # 2, if chickens >= foxes on both sides of the bank, move is valid.
-            if new_chicken_count >= new_fox_count and chickens_side_B >= foxes_side_B:
-                return True
-
-            # 3, otherwise, if there are more foxes on a bank that has 0 chickens, move is valid.
-            elif new_chicken_count < new_fox_count and new_chicken_count == 0:
-                return True
-            elif chickens_side_B < foxes_side_B and chickens_side_B == 0:
-                return True
-
-        # 4 move is invalid
-        return False
+        # 2, on either bank, chickens must not be outnumbered, unless there are no chickens to eat.
+        chickens_side_B = self.total_chickens - chickens
+        foxes_side_B = self.total_foxes - foxes
+        return (chickens == 0 or chickens >= foxes) and (chickens_side_B == 0 or chickens_side_B >= foxes_side_B)
+
+    def state_id(self, state):
+        """Pack a (chickens, foxes, boat) state into a single non-negative integer.
+        """
+        return (state[0] * (self.total_foxes + 1) + state[1]) * 2 + state[2]
+
+    def state_from_id(self, state_id):
+        """Unpack an integer produced by `state_id` back into a (chickens, foxes, boat) state.
+        """
+        bank, boat = divmod(state_id, 2)
+        chickens, foxes = divmod(bank, self.total_foxes + 1)
+        return chickens, foxes, boat
+
+    def num_state_ids(self):
+        """Return the number of distinct integer state ids (valid or not) for this problem.
+        """
+        return (self.total_chickens + 1) * (self.total_foxes + 1) * 2
 
     def __str__(self):
         string = "Chickens and foxes problem: " + str(self.start_state)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""This module implements a generalized river-crossing problem, with any number of chickens and foxes
+    and any boat capacity, along with a batch solver for many start configurations at once.
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+from array import array
+from FoxProblem import FoxProblem
+from StateGraph import StateGraph
+from SearchSolution import SearchSolution
+
+
+class RiverCrossingProblem(FoxProblem):
+    """
+        A Chickens-and-Foxes problem with `chickens` chickens, `foxes` foxes
+        and a boat that carries up to `boat_capacity` animals.
+        All animals (and the boat) start on the starting bank.
+    """
+
+    def __init__(self, chickens=3, foxes=3, boat_capacity=2):
+        self.boat_capacity = boat_capacity
+        super().__init__((chickens, foxes, 1))
+        self.graph = None
+        self.goal_distance = None
+        self.next_step = None
+
+    def __str__(self):
+        string = "River crossing problem: " + str(self.start_state)
+        string += " with boat capacity " + str(self.boat_capacity)
+        return string
+
+    def precompute(self):
+        """Materialize the state graph and run a single BFS backward from the goal state.
+            Afterwards, `goal_distance[i]` is the number of crossings from state id `i` to the goal
+            (-1 if the goal cannot be reached), and `next_step[i]` is the next state id on a shortest path.
+            The results are cached, so calling this again is free.
+        """
+        if self.graph is not None:
+            return
+
+        self.graph = StateGraph(self)
+        num_states = len(self.graph)
+        self.goal_distance = array("i", [-1]) * num_states
+        self.next_step = array("i", [-1]) * num_states
+
+        # BFS over predecessors: every state discovered from `state_id` reaches the goal through it.
+        goal_id = self.graph.goal_state
+        self.goal_distance[goal_id] = 0
+        layer = [goal_id]
+        while layer:
+            next_layer = []
+            for state_id in layer:
+                distance = self.goal_distance[state_id] + 1
+                for previous_id in self.graph.get_predecessors(state_id):
+                    if self.goal_distance[previous_id] == -1:
+                        self.goal_distance[previous_id] = distance
+                        self.next_step[previous_id] = state_id
+                        next_layer.append(previous_id)
+            layer = next_layer
+
+    def batch_solve(self, start_states):
+        """Solve the problem from every one of `start_states` using one shared precomputation.
+            :arg start_states: an iterable of (chickens, foxes, boat) states of this problem,
+            counting the animals on the starting bank.
+            :return: a dictionary mapping every start state to a SearchSolution with a shortest path.
+            Raises ValueError for a start state that is not a state of this problem.
+        """
+        self.precompute()
+
+        solutions = {}
+        for start_state in start_states:
+            chickens, foxes, boat = start_state
+            if not (0 <= chickens <= self.total_chickens and 0 <= foxes <= self.total_foxes and boat in (0, 1)):
+                raise ValueError(f"Invalid start state {start_state}: expected (chickens, foxes, boat) with "
+                                 f"0 <= chickens <= {self.total_chickens}, 0 <= foxes <= {self.total_foxes} "
+                                 f"and boat 0 or 1.")
+
+            solution = SearchSolution(self, "Batch BFS")
+            solution.problem_name = str(self) + ", starting from " + str(start_state)
+            solution.nodes_visited = len(self.graph)
+
+            # an unsafe start state was never discovered by the backward search,
+            # but it can still step onto a safe state on its first crossing.
+            state_id = self.state_id(start_state)
+            path = [state_id]
+            if self.goal_distance[state_id] == -1 and state_id != self.graph.goal_state:
+                reachable = [self.state_id(next_state) for next_state in self.get_successors(start_state)
+                             if self.goal_distance[self.state_id(next_state)] != -1]
+                if not reachable:
+                    solutions[start_state] = solution
+                    continue
+                state_id = min(reachable, key=lambda next_id: self.goal_distance[next_id])
+                path.append(state_id)
+
+            # follow the next-step pointers down to the goal.
+            while state_id != self.graph.goal_state:
+                state_id = self.next_step[state_id]
+                path.append(state_id)
+
+            solution.path = self.graph.decode_path(path)
+            solution.cost = len(solution.path) - 1
+            solutions[start_state] = solution
+
+        return solutions
+
+
+# A bit of test code
+
+if __name__ == "__main__":
+    test_problem = RiverCrossingProblem(5, 4, boat_capacity=3)
+    print(test_problem)
+    all_starts = [(chickens, foxes, 1) for chickens in range(6) for foxes in range(5)]
+    for start, start_solution in test_problem.batch_solve(all_starts).items():
+        print(start, len(start_solution.path))
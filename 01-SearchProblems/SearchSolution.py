@@ -16,6 +16,11 @@ class SearchSolution:
         self.search_method = search_method
         self.path = []
         self.nodes_visited = 0
+        self.cost = 0
+        self.nodes_per_depth = []
+        self.max_frontier = 0
+        self.nodes_generated = 0
+        self.nodes_pruned = 0
 
     def __str__(self):
         string = "----\n"
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""This module implements a fully materialized state graph for Chicken - and - Foxes problems,
+    with states numbered by integer ids and edges stored in flat adjacency arrays.
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+from array import array
+
+
+class StateGraph:
+    """
+        A precomputed state graph for a search problem exposing
+        `state_id`, `state_from_id` and `num_state_ids`, such as a FoxProblem.
+
+        The graph itself is a search problem over integer state ids
+        (it has `start_state`, `goal_state`, `get_successors`, `get_predecessors` and `is_goal`),
+        so BFS, DFS and IDS can run on it unchanged; `decode_path` turns their path back into states.
+
+        Edges are stored in compressed sparse row form: the successors of state `i`
+        are `successor_ids[successor_offsets[i]:successor_offsets[i + 1]]`.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.start_state = problem.state_id(problem.start_state)
+        self.goal_state = problem.state_id(problem.goal_state)
+
+        # build the forward adjacency arrays. Only valid states (and the start state) have edges.
+        num_states = problem.num_state_ids()
+        self.successor_offsets = array("i", [0])
+        self.successor_ids = array("i")
+        for state_id in range(num_states):
+            state = problem.state_from_id(state_id)
+            if state_id == self.start_state or problem.is_valid(state):
+                self.successor_ids.extend(problem.state_id(next_state)
+                                          for next_state in problem.get_successors(state))
+            self.successor_offsets.append(len(self.successor_ids))
+
+        # build the backward adjacency arrays by inverting every edge.
+        in_degree = [0] * num_states
+        for next_id in self.successor_ids:
+            in_degree[next_id] += 1
+        self.predecessor_offsets = array("i", [0])
+        for state_id in range(num_states):
+            self.predecessor_offsets.append(self.predecessor_offsets[-1] + in_degree[state_id])
+        self.predecessor_ids = array("i", bytes(4 * len(self.successor_ids)))
+        fill = array("i", self.predecessor_offsets[:-1])
+        for state_id in range(num_states):
+            for index in range(self.successor_offsets[state_id], self.successor_offsets[state_id + 1]):
+                next_id = self.successor_ids[index]
+                self.predecessor_ids[fill[next_id]] = state_id
+                fill[next_id] += 1
+
+    def __len__(self):
+        """Return the number of state ids in the graph.
+        """
+        return len(self.successor_offsets) - 1
+
+    def __str__(self):
+        return str(self.problem) + " (materialized)"
+
+    def get_successors(self, state_id):
+        """Return the ids of the states reachable from `state_id` in one step.
+        """
+        return self.successor_ids[self.successor_offsets[state_id]:self.successor_offsets[state_id + 1]]
+
+    def get_predecessors(self, state_id):
+        """Return the ids of the states from which `state_id` can be reached in one step.
+        """
+        return self.predecessor_ids[self.predecessor_offsets[state_id]:self.predecessor_offsets[state_id + 1]]
+
+    def is_goal(self, state_id):
+        return state_id == self.goal_state
+
+    def decode_path(self, path):
+        """Translate a path of state ids back into a path of problem states.
+        """
+        return [self.problem.state_from_id(state_id) for state_id in path]
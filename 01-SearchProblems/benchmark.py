@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""This file benchmarks the search algorithms implemented in this directory.
+
+    Run it to time BFS, DFS and IDS over a grid of Chickens-and-Foxes problems,
+    e.g. `python benchmark.py --csv results.csv --json results.json`.
+    Pass `--memory` to compare the memory use of the two BFS implementations instead.
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+import csv
+import json
+import tracemalloc
+from argparse import ArgumentParser
+from time import perf_counter
+
+from FoxProblem import FoxProblem
+from RiverCrossingProblem import RiverCrossingProblem
+from uninformed_search import bfs_search, ucs_search, dfs_search, graph_dfs_search, ids_search
+
+# the search algorithms to benchmark, by name, with the arguments to run them with.
+ALGORITHMS = {
+    "BFS": (bfs_search, {}),
+    "UCS": (ucs_search, {}),
+    "DFS": (dfs_search, {"depth_limit": 10_000}),
+    "graph DFS": (graph_dfs_search, {}),
+    "IDS": (ids_search, {"depth_limit": 10_000}),
+}
+
+# default grid of (chickens, foxes) problem sizes.
+SIZES = [(chickens, chickens - fewer_foxes)
+         for chickens in (3, 5, 10, 20, 30)
+         for fewer_foxes in (0, 1, 2)]
+
+# columns of the benchmark results, in order.
+FIELDS = ["problem", "algorithm", "seconds", "peak_memory_bytes",
+          "nodes_visited", "max_frontier", "solution_length"]
+
+
+def measure(search_fn, search_problem, **kwargs):
+    """Run `search_fn` on `search_problem`, tracking wall time and peak memory allocated during the run.
+        :return: a (solution, seconds, peak_bytes) tuple.
+    """
+    tracemalloc.start()
+    start_time = perf_counter()
+    solution = search_fn(search_problem, **kwargs)
+    seconds = perf_counter() - start_time
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return solution, seconds, peak_bytes
+
+
+def run_benchmarks(sizes=SIZES, algorithms=ALGORITHMS):
+    """Run every algorithm on a FoxProblem of every size.
+        :arg sizes: a list of (chickens, foxes) pairs.
+        :arg algorithms: a dictionary mapping names to (search function, keyword arguments) pairs.
+        :return: a list of result rows, each a dictionary keyed by the names in FIELDS.
+    """
+    rows = []
+    for chickens, foxes in sizes:
+        problem = FoxProblem((chickens, foxes, 1))
+        for name, (search_fn, kwargs) in algorithms.items():
+            solution, seconds, peak_bytes = measure(search_fn, problem, **kwargs)
+            rows.append({
+                "problem": str(problem),
+                "algorithm": name,
+                "seconds": seconds,
+                "peak_memory_bytes": peak_bytes,
+                "nodes_visited": solution.nodes_visited,
+                "max_frontier": solution.max_frontier,
+                "solution_length": len(solution.path),
+            })
+    return rows
+
+
+def write_csv(rows, filename):
+    """Write benchmark results to a CSV file, one row per (problem, algorithm) run.
+    """
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(rows, filename):
+    """Write benchmark results to a JSON file, as a list of objects.
+    """
+    with open(filename, "w") as f:
+        json.dump(rows, f, indent=2)
+
+
+def print_rows(rows):
+    """Print benchmark results as a table.
+    """
+    print("{:<42s} {:<5s} {:>9s} {:>12s} {:>10s} {:>9s} {:>7s}".format(
+        "problem", "algo", "seconds", "peak (KiB)", "visited", "frontier", "length"))
+    for row in rows:
+        print("{:<42s} {:<5s} {:>9.4f} {:>12.1f} {:>10d} {:>9d} {:>7d}".format(
+            row["problem"], row["algorithm"], row["seconds"], row["peak_memory_bytes"] / 1024,
+            row["nodes_visited"], row["max_frontier"], row["solution_length"]))
+
+
+def memory_comparison(problems):
+    """Compare peak memory of BFS through the generic graph search against BFS with packed states.
+    """
+    print("{:<55s} {:>10s} {:>14s} {:>14s} {:>7s}".format(
+        "problem", "nodes", "generic (KiB)", "compact (KiB)", "ratio"))
+
+    for problem in problems:
+        node_solution, _, node_peak = measure(bfs_search, problem, compact=False)
+        compact_solution, _, compact_peak = measure(bfs_search, problem, compact=True)
+        assert node_solution.path == compact_solution.path
+
+        print("{:<55s} {:>10d} {:>14.1f} {:>14.1f} {:>7.2f}".format(
+            str(problem), compact_solution.nodes_visited,
+            node_peak / 1024, compact_peak / 1024, node_peak / compact_peak))
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Benchmark the uninformed search algorithms.")
+    parser.add_argument("--csv", help="file to write results to, as CSV")
+    parser.add_argument("--json", help="file to write results to, as JSON")
+    parser.add_argument("--memory", action="store_true",
+                        help="compare memory of the generic and compact BFS instead")
+    args = parser.parse_args()
+
+    if args.memory:
+        memory_comparison([
+            FoxProblem((100, 80, 1)),
+            FoxProblem((500, 400, 1)),
+            RiverCrossingProblem(300, 300, boat_capacity=4),
+            RiverCrossingProblem(1000, 1000, boat_capacity=6),
+        ])
+    else:
+        results = run_benchmarks()
+        print_rows(results)
+        if args.csv:
+            write_csv(results, args.csv)
+        if args.json:
+            write_json(results, args.json)
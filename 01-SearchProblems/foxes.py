@@ -11,7 +11,9 @@ __email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
 __github__ = "@siavava"
 
 from FoxProblem import FoxProblem
-from uninformed_search import bfs_search, dfs_search, ids_search
+from StateGraph import StateGraph
+from RiverCrossingProblem import RiverCrossingProblem
+from uninformed_search import bfs_search, bidirectional_bfs_search, dfs_search, graph_dfs_search, ids_search
 
 # Create a few test problems:
 problem331 = FoxProblem((3, 3, 1))
@@ -24,7 +26,9 @@ problem551 = FoxProblem((5, 5, 1))
 #  in the solution object should be 0.
 
 print(bfs_search(problem331))
+print(bidirectional_bfs_search(problem331))
 print(dfs_search(problem331))
+print(graph_dfs_search(problem331))
 print(ids_search(problem331))
 #
 print(bfs_search(problem551))
@@ -32,10 +36,31 @@ print(dfs_search(problem551))
 print(ids_search(problem551))
 
 print(bfs_search(problem541))
+print(bidirectional_bfs_search(problem541))
 print(dfs_search(problem541))
 print(ids_search(problem541))
 
+# An unsafe goal: one chicken is left with both foxes on the far bank, so there is no solution
+#  and the bidirectional search must not walk backward out of the goal.
+# unsafe_goal_problem = RiverCrossingProblem(1, 2, boat_capacity=2)
+# print(bfs_search(unsafe_goal_problem))
+# print(bidirectional_bfs_search(unsafe_goal_problem))
+
 # testprob = FoxProblem((12, 10, 1))
 # print(bfs_search(testprob))
+# print(bidirectional_bfs_search(testprob))
 # print(dfs_search(testprob))
 # print(ids_search(testprob))
+
+# The same searches can run on a precomputed graph over integer state ids,
+#  which is faster when a problem is solved many times.
+# testgraph = StateGraph(testprob)
+# graph_solution = bfs_search(testgraph)
+# print(testgraph.decode_path(graph_solution.path))
+
+# Larger boats, and many start configurations solved with a single backward BFS.
+# river_problem = RiverCrossingProblem(10, 10, boat_capacity=4)
+# print(bfs_search(river_problem))
+# starts = [(chickens, foxes, 1) for chickens in range(11) for foxes in range(11)]
+# for start, batch_solution in river_problem.batch_solve(starts).items():
+#     print(start, len(batch_solution.path))
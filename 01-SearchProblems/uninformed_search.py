@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-"""This module implements several Graph Search algorithms, in particular; BFS, DFS, and IDS.
+"""This module implements several Graph Search algorithms, in particular; BFS, bidirectional BFS, UCS, DFS, graph DFS, and IDS.
 """
 __author__ = "Amittai"
 __copyright__ = "Copyright 2021"
@@ -9,16 +9,19 @@ __credits__ = ["Amittai", "Alberto Quattrini Li"]
 __email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
 __github__ = "@siavava"
 
-from collections import deque
+from array import array
 from SearchSolution import SearchSolution
 from FoxProblem import FoxProblem
+from graph_search import graph_search, backchain, FIFOFrontier, LIFOFrontier, PriorityFrontier
 
 
 # you might find a SearchNode class useful to wrap state objects,
 #  keep track of current depth for the dfs, and point to parent nodes
 class SearchNode:
     # each search node except the root has a parent node
-    # and all search nodes wrap a state object
+    # and all search nodes wrap a state object.
+    # `__slots__` drops the per-node `__dict__`, which dominates memory on large frontiers.
+    __slots__ = ("state", "parent")
 
     def __init__(self, state, parent=None):
         # you write this part
@@ -26,108 +29,291 @@ class SearchNode:
         self.parent = parent
 
 
-def bfs_search(search_problem: FoxProblem):
+def bfs_search(search_problem: FoxProblem, compact=True):
     """This method runs BFS search on the implicit Graph
      underlying a specified search  problem and start state.
         :arg search_problem: a FoxProblem instance.
+        :arg compact: if True and the problem can pack its states into integers
+            (`state_id`, `state_from_id` and `num_state_ids`), store packed states and a visited bitmap
+            instead of running the generic graph search over state tuples. Defaults to True.
         :return solution: a SearchSolution instance carrying information about the search run.
     """
 
-    # Initialize search solution, start node, visit queue, and a set to track visited states.
+    if compact and hasattr(search_problem, "state_id"):
+        return _compact_bfs_search(search_problem)
+
+    # otherwise, run the generic graph search with a FIFO frontier.
+    return graph_search(search_problem, FIFOFrontier(), "BFS")
+
+
+def ucs_search(search_problem):
+    """This method runs UCS -- Uniform-Cost Search on the implicit Graph
+     underlying a specified search  problem and start state.
+     Steps cost 1 unless the problem defines `step_cost(state, next_state)`.
+        :arg search_problem: a FoxProblem instance.
+        :return solution: a SearchSolution instance carrying information about the search run.
+    """
+    return graph_search(search_problem, PriorityFrontier(), "UCS")
+
+
+def graph_dfs_search(search_problem):
+    """This method runs graph DFS on the implicit Graph
+     underlying a specified search  problem and start state.
+     Unlike `dfs_search`, it has no depth limit and remembers every state it has reached,
+     so it never expands a state twice, at the cost of memory for all of them.
+        :arg search_problem: a FoxProblem instance.
+        :return solution: a SearchSolution instance carrying information about the search run.
+    """
+    return graph_search(search_problem, LIFOFrontier(), "Graph DFS")
+
+
+def _compact_bfs_search(search_problem):
+    """Run BFS with the search tree stored in parallel arrays of packed states and parent indices.
+        Node `i` has the packed state `node_states[i]` and the parent node `node_parents[i]`;
+        nodes are appended in the order they are discovered, so the unvisited part of the
+        arrays is the BFS queue itself. Used internally by `bfs_search`.
+    """
+
+    # Initialize search solution, node arrays, and the visited set (a bitmap over state ids).
     solution = SearchSolution(search_problem, "BFS")
-    start_node = SearchNode(search_problem.state)
-    visit_queue = deque()
-    visit_queue.append(start_node)
+    state_id, state_from_id = search_problem.state_id, search_problem.state_from_id
+    start_id = state_id(search_problem.start_state)
+
+    node_states = array("q", [start_id])
+    node_parents = array("i", [-1])
 
-    visited_states = set()
-    visited_states.add(search_problem.state)
+    visited_states = bytearray(search_problem.num_state_ids())
+    visited_states[start_id] = 1
 
-    # While nodes are enqueued for visitation,
-    while len(visit_queue) > 0:
+    # While there are discovered nodes that have not been visited,
+    head = 0
+    while head < len(node_states):
+        solution.max_frontier = max(solution.max_frontier, len(node_states) - head)
 
-        # get node at front of queue, add to visited set and visit it.
-        current_node = visit_queue.popleft()
+        # get the next node in BFS order and visit it.
+        current_state = state_from_id(node_states[head])
         solution.nodes_visited = solution.nodes_visited + 1
-        visited_states.add(current_node.state)
 
-        # If node is not goal state, get successors and enqueue them.
-        if not search_problem.is_goal(current_node.state):
-            for next_state in search_problem.get_successors(current_node.state):
-                if next_state not in visited_states:
-                    new_node = SearchNode(next_state, current_node)
-                    visit_queue.append(new_node)
-                    visited_states.add(new_node.state)
+        # If node is goal state, follow the parent indices back to the root and stop.
+        if search_problem.is_goal(current_state):
+            solution.path = [state_from_id(state) for state in backchain(head, node_states, node_parents)]
+            solution.cost = len(solution.path) - 1
+            break
+
+        # else, append its undiscovered successors to the node arrays.
+        for next_state in search_problem.get_successors(current_state):
+            next_id = state_id(next_state)
+            if not visited_states[next_id]:
+                visited_states[next_id] = 1
+                node_states.append(next_id)
+                node_parents.append(head)
+        head = head + 1
+
+    # finally, return the solution instance carrying data about the search run.
+    return solution
+
+
+def bidirectional_bfs_search(search_problem: FoxProblem):
+    """This method runs BFS simultaneously forward from the start state
+     and backward from the goal state, stopping once the two searches meet.
+        :arg search_problem: a FoxProblem instance. It must expose `goal_state` and `get_predecessors`.
+        :return solution: a SearchSolution instance carrying information about the search run.
+    """
+
+    # Initialize search solution and the root node of either search.
+    solution = SearchSolution(search_problem, "Bidirectional BFS")
+    start_node = SearchNode(search_problem.start_state)
+    goal_node = SearchNode(search_problem.goal_state)
+
+    # if the start state is the goal state, there is nothing to search.
+    if search_problem.is_goal(start_node.state):
+        solution.nodes_visited = 1
+        solution.path = [start_node.state]
+        return solution
+
+    # Each direction keeps a map from state to its search node (which doubles as the visited set),
+    # and the layer of nodes that will be expanded next.
+    forward_nodes = {start_node.state: start_node}
+    backward_nodes = {goal_node.state: goal_node}
+    forward_layer = [start_node]
+    backward_layer = [goal_node]
 
-        # else, mark node as end-point and backtrack to find path.
+    # While both searches still have nodes to expand,
+    while forward_layer and backward_layer:
+        solution.max_frontier = max(solution.max_frontier, len(forward_layer) + len(backward_layer))
+
+        # always grow the smaller frontier; this keeps both search trees shallow.
+        forward = len(forward_layer) <= len(backward_layer)
+        if forward:
+            expand, layer, nodes, other_nodes = search_problem.get_successors, forward_layer, forward_nodes, backward_nodes
         else:
-            final_node = current_node
-            while final_node is not None:
-                solution.path.insert(0, final_node.state)
-                final_node = final_node.parent
+            expand, layer, nodes, other_nodes = search_problem.get_predecessors, backward_layer, backward_nodes, forward_nodes
+
+        # expand the whole layer, remembering every state where the two searches touch.
+        next_layer = []
+        meeting_states = []
+        for current_node in layer:
+            solution.nodes_visited = solution.nodes_visited + 1
+            for next_state in expand(current_node.state):
+                if next_state not in nodes:
+                    new_node = SearchNode(next_state, current_node)
+                    nodes[next_state] = new_node
+                    next_layer.append(new_node)
+                    if next_state in other_nodes:
+                        meeting_states.append(next_state)
+
+        # if the searches met, stitch the two parent chains together through the shortest meeting point.
+        if meeting_states:
+            best_path = None
+            for state in meeting_states:
+                path = _stitch(forward_nodes[state], backward_nodes[state])
+                if best_path is None or len(path) < len(best_path):
+                    best_path = path
+            solution.path = best_path
+            solution.cost = len(best_path) - 1
             break
 
+        # otherwise, continue with the newly discovered layer.
+        if forward:
+            forward_layer = next_layer
+        else:
+            backward_layer = next_layer
+
     # finally, return the solution instance carrying data about the search run.
     return solution
 
 
+def _stitch(forward_node, backward_node):
+    """Join the forward chain (start -> meeting state) and the backward chain (meeting state -> goal)
+        into a single path. Used internally by `bidirectional_bfs_search`.
+    """
+
+    # walk the forward chain back to the start, then reverse it.
+    path = []
+    while forward_node is not None:
+        path.append(forward_node.state)
+        forward_node = forward_node.parent
+    path.reverse()
+
+    # walk the backward chain from the meeting state (already in the path) to the goal.
+    backward_node = backward_node.parent
+    while backward_node is not None:
+        path.append(backward_node.state)
+        backward_node = backward_node.parent
+
+    return path
+
+
 def dfs_search(search_problem, depth_limit=100, node=None, solution=None):
     """This method runs DFS search on the implicit Graph
      underlying a specified search  problem and start state.
+     The search uses an explicit stack rather than recursion, so deep limits cannot overflow Python's call stack.
         :arg search_problem: a FoxProblem instance.
-        :arg depth_limit: integer specifying maximum search depth. Defaults to 0.
-        :arg node: the current search node. Defaults to None.
+        :arg depth_limit: integer specifying maximum search depth. Defaults to 100.
+        :arg node: the search node to start from. Defaults to None (the problem's start state).
         :arg solution: The SearchSolution instance tracking search progress. Defaults to None.
         :return solution: a SearchSolution instance carrying information about the search run.
     """
 
-    # if no node object given, initialize node from start_state, and initialize the SearchSolution instance.
-    if node is None:
-        node = SearchNode(search_problem.start_state)
+    # if no solution object given, initialize one for this run.
+    if solution is None:
         solution = SearchSolution(search_problem, "DFS")
 
-    # initialize the starting node's state, add to path, and increment number of visited nodes.
-    current_state = node.state
-    solution.path.append(current_state)
+    start_state = search_problem.start_state if node is None else node.state
+    _depth_limited_search(search_problem, start_state, depth_limit, solution)
+
+    # return solution instance tracking the search information.
+    return solution
+
+
+def _depth_limited_search(search_problem, start_state, depth_limit, solution):
+    """Run one depth-limited, path-checking DFS from `start_state`, recording progress in `solution`.
+        Used internally by `dfs_search` and `ids_search`.
+        :return cutoff: True if some node was left unexpanded because of the depth limit.
+    """
+
+    # the path doubles as the DFS stack of states, and `successors` holds the remaining
+    # successors of every state on the path. `depth_reached` maps every state seen in this run
+    # to the shallowest depth it was reached at: states on the current path are always in it,
+    # so it replaces the O(depth) scan of the path for cycle checks, and it also stops the search
+    # from re-exploring a state that was already explored with at least as much depth to spare.
+    path = [start_state]
+    depth_reached = {start_state: 0}
+    successors = []
+    cutoff = False
+
+    solution.path = []
     solution.nodes_visited = solution.nodes_visited + 1
+    if search_problem.is_goal(start_state):
+        solution.path = path
+        return cutoff
 
-    # for each next state, if not yet visited and within search depth, recursively visit.
-    for next_state in search_problem.get_successors(current_state):
-        if depth_limit > 0 and next_state not in solution.path:
-            next_node = SearchNode(next_state, node)
-            dfs_search(search_problem, depth_limit=depth_limit-1, node=next_node, solution=solution)
+    if depth_limit > 0:
+        successors.append(iter(search_problem.get_successors(start_state)))
+        solution.max_frontier = max(solution.max_frontier, len(successors))
+    else:
+        cutoff = True
 
-    # If no fruitful path found, remove the state from the path.
-    if not search_problem.is_goal(solution.path[-1]):
-        solution.path.pop()
+    while successors:
 
-    # return solution instance tracking the search information.
-    return solution
+        # get the next unexplored successor of the deepest state on the path.
+        # If there is none, the state is exhausted: backtrack.
+        next_state = next(successors[-1], None)
+        if next_state is None:
+            successors.pop()
+            path.pop()
+            continue
+
+        # skip states on the current path (cycles) and states already reached at most this deep.
+        depth = len(path)
+        if depth_reached.get(next_state, depth + 1) <= depth:
+            continue
+
+        # visit the state.
+        depth_reached[next_state] = depth
+        path.append(next_state)
+        solution.nodes_visited = solution.nodes_visited + 1
+
+        # if it is the goal, the path is the solution.
+        if search_problem.is_goal(next_state):
+            solution.path = path
+            solution.cost = len(path) - 1
+            return cutoff
+
+        # if within search depth, descend into it; otherwise, step back.
+        if depth < depth_limit:
+            successors.append(iter(search_problem.get_successors(next_state)))
+            solution.max_frontier = max(solution.max_frontier, len(successors))
+        else:
+            cutoff = True
+            path.pop()
+
+    return cutoff
 
 
 def ids_search(search_problem, depth_limit=30):
     """This method runs IDS -- Iterative Deepening Search on the implicit Graph
      underlying a specified search  problem and start state.
+     The number of nodes visited at each depth is recorded in `solution.nodes_per_depth`.
         :arg search_problem: a FoxProblem instance.
-        :arg depth_limit: integer specifying maximum search depth. Defaults to 0.
+        :arg depth_limit: integer specifying maximum search depth. Defaults to 30.
         :return solution: a SearchSolution instance carrying information about the search run.
     """
-    # 1. Initialize the start node and solution.
-    start_node = SearchNode(search_problem.start_state)
+    # 1. Initialize the solution, shared by every iteration.
     solution = SearchSolution(search_problem, "IDS")
 
     # 2. Iterate over depths, incrementing by 1 at each step.
     for current_depth in range(0, depth_limit):
 
         # 3. Do a DFS with the current depth.
-        dfs_search(search_problem, node=start_node, solution=solution, depth_limit=current_depth)
+        visited_before = solution.nodes_visited
+        cutoff = _depth_limited_search(search_problem, search_problem.start_state, current_depth, solution)
+        solution.nodes_per_depth.append(solution.nodes_visited - visited_before)
 
-        # 4. If the goal has been found, stop checking deeper depths (break the loop)
-        if len(solution.path) > 0 and search_problem.is_goal(solution.path[-1]):
+        # 4. If the goal has been found, or no node was cut off by the depth limit
+        #    (so deeper searches cannot see anything new), stop checking deeper depths.
+        if solution.path or not cutoff:
             break
 
-        # 5. Or else... Reset the path (just to be safe!)
-        else:
-            solution.path = []
-
     # Return the final solution.
     return solution
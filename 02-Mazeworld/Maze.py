@@ -10,7 +10,11 @@ __credits__ = ["Amittai", "Alberto Quattrini Li"]
 __email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
 __github__ = "@siavava"
 
+import os
 from time import sleep
+from array import array
+from collections import deque
+from hashlib import sha1
 
 # Maze.py
 #  original version by db, Fall 2017
@@ -35,25 +39,46 @@ from time import sleep
 # the command \robot x y adds a robot at a location. The first robot added
 # has index 0, and so forth.
 
+# distance recorded for cells that cannot reach a location.
+UNREACHABLE = 2**20
+
+# cache of BFS distance maps, keyed by (maze file, x, y), shared by every Maze loaded from the same file.
+_distance_maps = {}
+
+# directions of the jump tables for Jump Point Search, as (dx, dy): west, south, east and north.
+JUMP_DIRECTIONS = ((-1, 0), (0, -1), (1, 0), (0, 1))
+
+# distance recorded in all-pairs distance tables for cells that cannot reach each other.
+TABLE_UNREACHABLE = 0xFFFF
+
+# directory (next to the maze files) where all-pairs distance tables are saved,
+# and the cache of tables already loaded, keyed by the path they are saved under.
+DISTANCE_CACHE_DIR = ".distances"
+_distance_tables = {}
+
 
 class Maze:
 
     # internal structure:
-    #   self.walls: set of tuples with wall locations
+    #   self.map: list of characters, row by row from the top
     #   self.width: number of columns
-    #   self.rows
+    #   self.height: number of rows
+    #   self.floor: flat bytearray mask over the map, 1 for floor cells
+    #   self.neighbors: for every cell, the tuple of adjacent floor locations
 
     def __init__(self, mazefilename):
 
+        self.filename = mazefilename
         self.robotloc = []
         # read the maze file into a list of strings
         f = open(mazefilename)
         lines = []
         for line in f:
-            line = line.strip()
+            # keep leading and trailing spaces: they are (non-floor) cells in maps with open areas.
+            line = line.rstrip("\r\n")
             # ignore blank limes
-            if len(line) != 0:
-                if line[0] == "\\":
+            if len(line.strip()) != 0:
+                if line.lstrip()[0] == "\\":
                     #print("command")
                     # there's only one command, \robot, so assume it is that
                     parms = line.split()
@@ -67,17 +92,67 @@ class Maze:
                 
         f.close()
 
-        self.width = len(lines[0])
+        # rows may differ in length; pad them all to the widest with (non-floor) spaces.
+        self.width = max(len(line) for line in lines)
         self.height = len(lines)
 
-        self.map = list("".join(lines))
+        self.map = list("".join(line.ljust(self.width) for line in lines))
 
+        # precompute the floor mask and the floor neighbors of every cell,
+        # so collision checks do not have to touch the character map.
+        num_cells = self.width * self.height
+        self.floor = bytearray(num_cells)
+        self.floor[:] = bytearray(1 if char == "." else 0 for char in self.map[:num_cells]).ljust(num_cells, b"\0")
+        self.neighbors = [()] * num_cells
+        for y in range(self.height):
+            for x in range(self.width):
+                self.neighbors[self.index(x, y)] = tuple(
+                    (nx, ny) for nx, ny in ((x - 1, y), (x, y - 1), (x + 1, y), (x, y + 1))
+                    if self.is_floor(nx, ny))
+
+        # the same neighbors as cell indices, and the number of bits a cell index takes,
+        # for problems that pack their states into a single integer (see `pack`).
+        self.neighbor_indices = [tuple(self.index(nx, ny) for nx, ny in cell_neighbors)
+                                 for cell_neighbors in self.neighbors]
+        self.cell_bits = max(1, (num_cells - 1).bit_length())
+
+        # jump tables for Jump Point Search, computed on the first call to `jump_table`.
+        self._jump_table = None
 
 
     def index(self, x, y):
         return (self.height - y - 1) * self.width + x
 
 
+    def location(self, index):
+        """
+            Return the (x, y) location of a cell index; the inverse of `index`.
+        """
+        row, x = divmod(index, self.width)
+        return x, self.height - row - 1
+
+    def pack(self, state):
+        """
+            Pack a state of robot locations (x0, y0, x1, y1, ...) into a single integer,
+            holding the cell index of robot i in bits [i * cell_bits, (i + 1) * cell_bits).
+            Moving a robot is then an integer addition, and states hash as fast as any integer.
+        """
+        packed = 0
+        for i in range(len(state) - 2, -1, -2):
+            packed = (packed << self.cell_bits) | self.index(state[i], state[i + 1])
+        return packed
+
+    def unpack(self, packed, num_robots):
+        """
+            Unpack an integer produced by `pack` back into a state of robot locations.
+        """
+        mask = (1 << self.cell_bits) - 1
+        state = []
+        for i in range(num_robots):
+            state.extend(self.location(packed & mask))
+            packed >>= self.cell_bits
+        return tuple(state)
+
     # returns True if the location is a floor
     def is_floor(self, x, y):
         if x < 0 or x >= self.width:
@@ -85,19 +160,166 @@ class Maze:
         if y < 0 or y >= self.height:
             return False
 
-        return self.map[self.index(x, y)] == "."
-    
-    def can_move(self, x, y, current_state):
+        return self.floor[self.index(x, y)] == 1
+
+    def floor_neighbors(self, x, y):
+        """
+            Return the floor locations one step west, south, east and north of (x, y), in that order.
+        """
+        return self.neighbors[self.index(x, y)]
+
+    @staticmethod
+    def occupied(state):
+        """
+            Return the set of (x, y) locations occupied by the robots in a state.
+        """
+        return set(zip(state[0::2], state[1::2]))
+
+    def can_move(self, x, y, current_state, occupied=None):
         """
             Check if a given point in the maze can be moved to.
             This method checks if the point is a valid room and doesn't have an occupant.
+            :arg occupied: the set of locations occupied in `current_state`, if already computed.
         """
         if self.is_floor(x, y):
-            return not self.has_robot(x, y, state=current_state)
-        
+            if occupied is None:
+                return not self.has_robot(x, y, state=current_state)
+            return (x, y) not in occupied
+
         return False
 
 
+    def distance_map(self, x, y):
+        """
+            Return the number of steps from every cell to (x, y), walking only on floor cells.
+            The result is an array indexed like the map (see `index`); cells that cannot
+            reach (x, y) hold UNREACHABLE. Maps are computed with one BFS and cached per maze file.
+        """
+        key = (self.filename, x, y)
+        if key in _distance_maps:
+            return _distance_maps[key]
+
+        # moves are reversible, so a BFS outwards from (x, y) gives the distances towards it.
+        distances = array("i", [UNREACHABLE]) * (self.width * self.height)
+        if self.is_floor(x, y):
+            distances[self.index(x, y)] = 0
+            queue = deque([(x, y)])
+            while queue:
+                cx, cy = queue.popleft()
+                next_distance = distances[self.index(cx, cy)] + 1
+                for nx, ny in self.floor_neighbors(cx, cy):
+                    if distances[self.index(nx, ny)] == UNREACHABLE:
+                        distances[self.index(nx, ny)] = next_distance
+                        queue.append((nx, ny))
+
+        _distance_maps[key] = distances
+        return distances
+
+    def distance_table(self):
+        """
+            Return the number of steps between every pair of floor cells, as `(floor_numbers, table)`:
+            `floor_numbers[i]` numbers the floor cell of index `i` from 0 (and is -1 for walls), and the
+            distance between floor cells numbered `a` and `b` is `table[a * num_floor + b]`, or
+            TABLE_UNREACHABLE if they are not connected.
+            The table takes one BFS per floor cell, so it is saved to DISTANCE_CACHE_DIR next to the
+            maze file, under a name that changes with the map, and loaded from there on later runs.
+            A saved table of the wrong size, or one that cannot be read, is computed and saved again.
+        """
+        cache_dir = os.path.join(os.path.dirname(self.filename), DISTANCE_CACHE_DIR)
+        digest = sha1("".join(self.map).encode()).hexdigest()[:16]
+        cache_file = os.path.join(cache_dir, f"{os.path.basename(self.filename)}-{self.width}x{self.height}-{digest}.dist")
+        if cache_file in _distance_tables:
+            return _distance_tables[cache_file]
+
+        # number the floor cells.
+        floor_numbers = array("i", [-1]) * (self.width * self.height)
+        floor_cells = [cell for cell in range(self.width * self.height) if self.floor[cell]]
+        for number, cell in enumerate(floor_cells):
+            floor_numbers[cell] = number
+        num_floor = len(floor_cells)
+
+        # load the table if it has been saved before...
+        table = array("H")
+        if os.path.exists(cache_file) and os.path.getsize(cache_file) == table.itemsize * num_floor * num_floor:
+            try:
+                with open(cache_file, "rb") as f:
+                    table.fromfile(f, num_floor * num_floor)
+            except (EOFError, ValueError):
+                table = array("H")
+
+        # ...otherwise, run a BFS from every floor cell and save the table.
+        if len(table) != num_floor * num_floor:
+            table = array("H", [TABLE_UNREACHABLE]) * (num_floor * num_floor)
+            for number, cell in enumerate(floor_cells):
+                row = number * num_floor
+                table[row + number] = 0
+                queue = deque([cell])
+                while queue:
+                    current = queue.popleft()
+                    next_distance = table[row + floor_numbers[current]] + 1
+                    for neighbor in self.neighbor_indices[current]:
+                        if table[row + floor_numbers[neighbor]] == TABLE_UNREACHABLE:
+                            table[row + floor_numbers[neighbor]] = next_distance
+                            queue.append(neighbor)
+
+            # write a temporary file and rename it, so that a run stopped halfway never leaves a partial table.
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(temp_file, "wb") as f:
+                table.tofile(f)
+            os.replace(temp_file, cache_file)
+
+        _distance_tables[cache_file] = (floor_numbers, table)
+        return floor_numbers, table
+
+    def jump_table(self):
+        """
+            Return the JPS+ jump tables of the maze: for each direction in JUMP_DIRECTIONS, an array indexed like
+            the map (see `index`) that holds, for every floor cell, how far a single robot moving that way
+            from the cell goes before it stops:
+                k > 0: it reaches a jump point (see below) after k steps.
+                k <= 0: it reaches no jump point, and hits a wall after -k steps (0 if it cannot move that way).
+            A robot moving east or west stops at a cell with a forced neighbor: a floor cell north or south
+            of it, next to a wall on the side it came from, which could only be reached optimally through it.
+            A robot moving north or south stops at a cell with a forced neighbor east or west of it,
+            or from which a robot moving east or west would reach a jump point.
+            The tables ignore goals; a search stops on the goal's row or column itself.
+        """
+        if self._jump_table is not None:
+            return self._jump_table
+
+        # fill each table from the far end of every row or column, so that the entry of
+        # the next cell along the direction is known before the entry of the cell itself.
+        tables = [array("i", [0]) * (self.width * self.height) for _ in JUMP_DIRECTIONS]
+        order = (2, 0, 1, 3)    # east and west first: the north and south tables depend on them.
+        for direction in order:
+            dx, dy = JUMP_DIRECTIONS[direction]
+            table = tables[direction]
+            xs = range(self.width - 1, -1, -1) if dx > 0 else range(self.width)
+            ys = range(self.height - 1, -1, -1) if dy > 0 else range(self.height)
+            for y in ys:
+                for x in xs:
+                    if not self.is_floor(x, y) or not self.is_floor(x + dx, y + dy):
+                        continue
+
+                    # the next cell is a jump point, or the run goes on past it.
+                    nx, ny = x + dx, y + dy
+                    if dx:
+                        stop = any(self.is_floor(nx, ny + side) and not self.is_floor(x, ny + side) for side in (-1, 1))
+                    else:
+                        stop = (any(self.is_floor(nx + side, ny) and not self.is_floor(nx + side, y) for side in (-1, 1))
+                                or tables[0][self.index(nx, ny)] > 0 or tables[2][self.index(nx, ny)] > 0)
+                    next_jump = table[self.index(nx, ny)]
+                    if stop:
+                        table[self.index(x, y)] = 1
+                    elif next_jump > 0:
+                        table[self.index(x, y)] = next_jump + 1
+                    else:
+                        table[self.index(x, y)] = next_jump - 1
+
+        self._jump_table = tables
+        return tables
+
     def has_robot(self, x, y, state=None):
         if x < 0 or x >= self.width:
             return False
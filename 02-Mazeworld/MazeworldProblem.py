@@ -17,11 +17,39 @@ class MazeworldProblem:
 
     ## you write the constructor, and whatever methods your astar function needs
 
-    def __init__(self, maze, goal_locations):
+    def __init__(self, maze, goal_locations, true_distances=False, packed=False):
+        """
+            Constructor.
+            :arg maze: the Maze to navigate.
+            :arg goal_locations: tuple of goal coordinates (x0, y0, x1, y1, ...), one pair per robot.
+            :arg true_distances [optional]: if True, compute the wall-aware distance
+            from every cell to every goal location now, for `true_distance_heuristic`.
+            Otherwise they are computed on the heuristic's first call.
+            :arg packed [optional]: if True, states are single integers holding the cell index
+            of every robot (see `Maze.pack`), so moves are integer additions instead of new tuples.
+            Use `unpack_path` to turn a path of packed states back into coordinates.
+        """
         self.maze = maze
         self.goal_locations = goal_locations
         self.start_state = tuple(maze.robotloc)
         self.visited_states = 0
+        self.goal_distances = None
+        if true_distances:
+            self.compute_goal_distances()
+
+        self.packed = packed
+        self.num_robots = len(maze.robotloc) // 2
+        if packed:
+            self.start_state = maze.pack(self.start_state)
+            self.packed_goal = maze.pack(goal_locations)
+            self.goal_mask = (1 << (maze.cell_bits * (len(goal_locations) // 2))) - 1
+            self.shifts = range(0, maze.cell_bits * self.num_robots, maze.cell_bits)
+            self.cell_mask = (1 << maze.cell_bits) - 1
+
+            # the Manhattan distance from every cell to each robot's goal, so the heuristic needs no unpacking.
+            locations = [maze.location(cell) for cell in range(maze.width * maze.height)]
+            self.goal_manhattan = [[abs(goal_locations[i] - x) + abs(goal_locations[i + 1] - y) for x, y in locations]
+                                   for i in range(0, len(goal_locations), 2)]
 
 
     def __str__(self):
@@ -34,35 +62,60 @@ class MazeworldProblem:
         """
         Returns a list of (action, state, cost) tuples corresponding to edges in the graph.
         """
-        
+        if self.packed:
+            return self._packed_successors(state)
+
         # Initialzie successors, 
-        # loop over all bots and find their possible next movements,
+        # collect the occupied locations once for the state,
+        # then loop over all bots and find their possible next movements
+        # (from the maze's precomputed floor neighbors),
         # and add them to the array of possible next states.
         
         successors = []
-        num_bots = len(state) // 2
+        occupied = self.maze.occupied(state)
         
-        for bot in range(num_bots):
-            ix = 2 * bot
+        for ix in range(0, len(state), 2):
             iy = ix + 1
             x, y = state[ix], state[iy]
             
-            for step in [-1, 1]:
-                # if bot can move in x direction, add to successors.
-                if self.maze.can_move(x+step, y, state):
-                    
-                    new_state = self.move(state, index=ix, new_val=x+step)
-                    successors.append(new_state)
-                    
-                # if bot can move in y direction, add to successors.
-                if self.maze.can_move(x, y+step, state):
+            for next_x, next_y in self.maze.floor_neighbors(x, y):
+                if (next_x, next_y) not in occupied:
                     
-                    new_state = self.move(state, index=iy, new_val=y+step)
+                    # the bot moves along exactly one axis.
+                    if next_x != x:
+                        new_state = self.move(state, index=ix, new_val=next_x)
+                    else:
+                        new_state = self.move(state, index=iy, new_val=next_y)
                     successors.append(new_state)
 
         # return compiled array of successors
         return successors
-    
+
+    def _packed_successors(self, state):
+        """
+            `get_successors` for packed states: moving a robot adds the change
+            of its cell index, shifted into place, to the state.
+        """
+        cell_mask = self.cell_mask
+        neighbor_indices = self.maze.neighbor_indices
+        cells = [(state >> shift) & cell_mask for shift in self.shifts]
+
+        successors = []
+        for shift, cell in zip(self.shifts, cells):
+            for next_cell in neighbor_indices[cell]:
+                if next_cell not in cells:
+                    successors.append(state + ((next_cell - cell) << shift))
+
+        return successors
+
+    def unpack_path(self, path):
+        """
+            Given a path of states, return it as a path of (x0, y0, x1, y1, ...) coordinate tuples.
+        """
+        if not self.packed:
+            return path
+        return [self.maze.unpack(state, self.num_robots) for state in path]
+
     def move(self, state, index=None, new_val=None):
         """
             Given a state and an action, returns the new state.
@@ -85,7 +138,9 @@ class MazeworldProblem:
         """
             Check if a given state is the goal state for a game instance.
         """
-        
+        if self.packed:
+            return state & self.goal_mask == self.packed_goal
+
         # loop over the state, checking if all positions match the goal state.
         for i in range(len(state)):
             if state[i] != self.goal_locations[i]:
@@ -100,7 +155,7 @@ class MazeworldProblem:
         """
         
         # reset the robot locations in the maze
-        self.maze.robotloc = tuple(self.start_state)
+        self.maze.robotloc = tuple(self.unpack_path([self.start_state])[0])
 
         for state in path:
             print(str(self))
@@ -114,6 +169,13 @@ class MazeworldProblem:
             Calculate the manhattan distance between the current state and the goal state.
         """
         
+        if self.packed:
+            acc = 0
+            cell_mask = self.cell_mask
+            for shift, distances in zip(self.shifts, self.goal_manhattan):
+                acc = acc + distances[(state >> shift) & cell_mask]
+            return acc
+
         if not state:
             return 0
         
@@ -129,6 +191,37 @@ class MazeworldProblem:
         return acc
 
 
+    def compute_goal_distances(self):
+        """
+            Look up (or compute, with one BFS per goal) the distance from every cell to each robot's goal.
+            The distance maps are cached by the maze, so repeated solves on the same maze file are nearly free.
+        """
+        self.goal_distances = [self.maze.distance_map(self.goal_locations[i], self.goal_locations[i + 1])
+                               for i in range(0, len(self.goal_locations), 2)]
+
+    def true_distance_heuristic(self, state):
+        """
+            Calculate the sum of each robot's shortest wall-aware distance to its goal location.
+            Every action moves one robot by one step, and other robots can only get in the way,
+            so this never overestimates the remaining cost (it is admissible), and it dominates
+            the Manhattan heuristic.
+        """
+        if self.goal_distances is None:
+            self.compute_goal_distances()
+
+        acc = 0
+        if self.packed:
+            cell_mask = self.cell_mask
+            for shift, distances in zip(self.shifts, self.goal_distances):
+                acc = acc + distances[(state >> shift) & cell_mask]
+            return acc
+
+        index = self.maze.index
+        for i, distances in zip(range(0, len(state), 2), self.goal_distances):
+            acc = acc + distances[index(state[i], state[i + 1])]
+        return acc
+
+
 # A unit test for the MazeworldProblem class.
 def unit_test():
     test_maze5 = Maze("maze5.maz")
@@ -1,7 +1,11 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
 
-"""This module implements a priority queue.
+"""This module implements a priority queue, and an indexed priority queue
+    whose items can have their priority lowered in place.
+
+    The same file is kept in 01-SearchProblems and 02-Mazeworld, so each assignment runs on its own:
+    edit both copies together (`make check` fails if they differ).
 """
 __author__ = "Amittai"
 __copyright__ = "Copyright 2021"
@@ -94,3 +98,153 @@ class PriorityQueue(object):
         """Clear the queue.
         """
         self._heap = []
+
+
+class IndexedPriorityQueue(object):
+    """
+        A priority queue of distinct, hashable items, implemented as a binary heap
+        with an index from every item to its position in the heap.
+
+        The index makes `item in queue` an O(1) lookup, and lets `decrease_key` lower the priority
+        of an item already in the queue in O(log n), instead of pushing a duplicate entry and
+        skipping the stale one when it is popped (lazy deletion). The heap then never holds more
+        entries than there are items in the queue.
+
+        Priorities may be any comparable values; ties are popped in no particular order.
+    """
+    def __init__(self):
+        self._heap = list()         # (priority, item) pairs, in heap order.
+        self._position = dict()     # item -> index of its pair in the heap.
+
+    def __len__(self):
+        """
+            Return the length of the queue.
+        """
+        return len(self._heap)
+
+    def __str__(self):
+        """
+            Return a string representation of the queue.
+        """
+        return str(self._heap)
+
+    def __bool__(self):
+        """Check if the queue is NOT empty.
+        """
+        return bool(self._heap)
+
+    def __iter__(self):
+        """Return an iterator over the items in the queue, in no particular order.
+        """
+        return iter(self._position)
+
+    def __contains__(self, item):
+        """Check if the queue contains an item, in O(1).
+        """
+        return item in self._position
+
+    def __repr__(self):
+        """Return a string representation of the queue.
+        """
+        return repr(self._heap)
+
+    def push(self, item, priority):
+        """Push an item with a priority to the queue.
+            If the item is already in the queue, its priority is changed instead.
+        """
+        position = self._position.get(item)
+        if position is None:
+            self._heap.append((priority, item))
+            self._sift_up(len(self._heap) - 1)
+        elif priority < self._heap[position][0]:
+            self.decrease_key(item, priority)
+        else:
+            self._heap[position] = (priority, item)
+            self._sift_down(position)
+
+    def decrease_key(self, item, priority):
+        """Lower the priority of an item already in the queue.
+        """
+        position = self._position[item]
+        if self._heap[position][0] < priority:
+            raise ValueError('New priority is greater than the current priority.')
+
+        self._heap[position] = (priority, item)
+        self._sift_up(position)
+
+    def priority(self, item):
+        """Get the priority of an item in the queue.
+        """
+        return self._heap[self._position[item]][0]
+
+    def pop(self):
+        """Pop the item with the highest priority (the lowest value) from the queue.
+            :return: an (item, priority) pair.
+        """
+        if not self._heap:
+            raise IndexError('Pop from empty queue.')
+
+        # move the last pair to the root, then sift it down into place.
+        priority, item = self._heap[0]
+        last = self._heap.pop()
+        del self._position[item]
+        if self._heap:
+            self._heap[0] = last
+            self._sift_down(0)
+        return item, priority
+
+    def is_empty(self):
+        """Check if the queue is empty.
+        """
+        return not self._heap
+
+    def peek(self):
+        """Get the item with the highest priority from the queue, as an (item, priority) pair.
+        """
+        if not self._heap:
+            raise IndexError('Peek from empty queue.')
+
+        priority, item = self._heap[0]
+        return item, priority
+
+    def clear(self):
+        """Clear the queue.
+        """
+        self._heap = []
+        self._position = {}
+
+    def _sift_up(self, position):
+        """Move the pair at `position` towards the root until its parent has a lower priority,
+            updating the index of every pair it passes.
+        """
+        heap, index = self._heap, self._position
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not entry[0] < heap[parent][0]:
+                break
+            heap[position] = heap[parent]
+            index[heap[position][1]] = position
+            position = parent
+        heap[position] = entry
+        index[entry[1]] = position
+
+    def _sift_down(self, position):
+        """Move the pair at `position` towards the leaves until both its children have higher priorities,
+            updating the index of every pair it passes.
+        """
+        heap, index = self._heap, self._position
+        entry = heap[position]
+        size = len(heap)
+        child = 2 * position + 1
+        while child < size:
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child = child + 1
+            if not heap[child][0] < entry[0]:
+                break
+            heap[position] = heap[child]
+            index[heap[position][1]] = position
+            position = child
+            child = 2 * position + 1
+        heap[position] = entry
+        index[entry[1]] = position
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""This module implements a space-time reservation table,
+    recording which maze cells (and moves between cells) are taken at which time steps.
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai", "Alberto Quattrini Li"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+
+class ReservationTable:
+    """
+        A set of space-time reservations for robots moving in a maze.
+        Time advances in steps, and at every step each robot either waits or moves to an adjacent cell.
+
+        Three kinds of entries are stored:
+            cells: (x, y, t), the cell (x, y) is taken at time t.
+            moves: (x, y, next_x, next_y, t), a robot moves from (x, y) to (next_x, next_y)
+                between times t and t + 1; nobody may make the opposite move at the same time.
+            parked: (x, y) -> t, a robot reaches its goal (x, y) at time t and stays there for good.
+
+        The prioritized planner fills one table with the paths of the robots planned so far;
+        conflict-based search keeps one table of constraints per robot.
+    """
+
+    def __init__(self):
+        self.cells = set()
+        self.moves = set()
+        self.parked = {}
+
+        # the latest time any cell is reserved, and the latest time each single cell is reserved.
+        self.last_time = 0
+        self.last_cell_time = {}
+
+    def reserve_cell(self, x, y, t):
+        self.cells.add((x, y, t))
+        self.last_time = max(self.last_time, t)
+        self.last_cell_time[(x, y)] = max(self.last_cell_time.get((x, y), -1), t)
+
+    def reserve_move(self, x, y, next_x, next_y, t):
+        self.moves.add((x, y, next_x, next_y, t))
+        self.last_time = max(self.last_time, t + 1)
+
+    def reserve_path(self, path):
+        """
+            Reserve every cell and move along a path of (x, y) locations, one per time step,
+            and park the robot at the end of the path.
+        """
+        for t, (x, y) in enumerate(path):
+            self.reserve_cell(x, y, t)
+            if t > 0 and path[t - 1] != (x, y):
+                self.reserve_move(path[t - 1][0], path[t - 1][1], x, y, t - 1)
+
+        x, y = path[-1]
+        self.parked[(x, y)] = len(path) - 1
+
+    def is_free(self, x, y, t):
+        """
+            Check that the cell (x, y) is not taken at time t.
+        """
+        if (x, y, t) in self.cells:
+            return False
+        parked_time = self.parked.get((x, y))
+        return parked_time is None or t < parked_time
+
+    def can_move(self, x, y, next_x, next_y, t):
+        """
+            Check that a robot at (x, y) at time t can be at (next_x, next_y) at time t + 1:
+            the target cell is free then, and no robot crosses the same edge the other way.
+        """
+        return self.is_free(next_x, next_y, t + 1) and (next_x, next_y, x, y, t) not in self.moves
+
+    def can_park(self, x, y, t):
+        """
+            Check that a robot reaching (x, y) at time t can stay there for good.
+        """
+        return self.last_cell_time.get((x, y), -1) < t
+
+    def copy(self):
+        table = ReservationTable()
+        table.cells = set(self.cells)
+        table.moves = set(self.moves)
+        table.parked = dict(self.parked)
+        table.last_time = self.last_time
+        table.last_cell_time = dict(self.last_cell_time)
+        return table
+
+    def __len__(self):
+        return len(self.cells) + len(self.moves) + len(self.parked)
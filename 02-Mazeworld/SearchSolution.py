@@ -11,6 +11,14 @@ class SearchSolution:
         self.path = []
         self.nodes_visited = 0
         self.cost = 0
+        self.max_frontier = 0
+        self.nodes_generated = 0
+        self.nodes_pruned = 0
+
+        # bounded-suboptimal searches guarantee `cost` is at most `suboptimality` times the optimal cost;
+        # anytime searches also record every (seconds, cost, suboptimality) solution they improve on.
+        self.suboptimality = 1
+        self.improvements = []
 
     def __str__(self):
         string = "----\n"
@@ -26,6 +34,8 @@ class SearchSolution:
 
             string = string.format(self.problem_name, self.search_method,
                 self.nodes_visited, len(self.path), self.cost, str(self.path))
+            if self.suboptimality != 1:
+                string += "cost within {:.3g} times the optimal cost\n".format(self.suboptimality)
         else:
             string += "no solution found after visiting {:d} nodes\n"
             string = string.format(self.problem_name, self.search_method, self.nodes_visited)
@@ -12,20 +12,64 @@ __github__ = "@siavava"
 
 
 from time import sleep
+from array import array
 # from math import max, min
 from astar_search import astar_search
+from Maze import UNREACHABLE, TABLE_UNREACHABLE
 
 class SensorlessProblem():
     
-    def __init__(self, maze):
+    def __init__(self, maze, packed=False, prune_dominated=True):
+        """
+            Constructor.
+            :arg maze: the Maze to navigate; its robots are the possible start locations.
+            :arg packed [optional]: if True, states are single integers with one bit set
+            for every possible location (bit `i` for the cell of index `i`, see `Maze.index`),
+            and moves shift all the possible locations at once instead of checking every one for walls.
+            Otherwise, states are (x0, y0, x1, y1, ...) tuples. `locate` returns the path as tuples either way.
+            :arg prune_dominated [optional]: if True [default], the search skips any state whose possible
+            locations include all those of a state it already expanded at no greater cost (see `dominance_key`).
+
+            Either way, states are canonical: every possible location appears once, in sorted order,
+            so two paths that leave the robot in the same set of possible locations reach the same state.
+        """
         self.maze = maze
-        self.start_state = tuple(maze.robotloc)
         self.visited_states = 0
         self.actions = []
 
+        # the search only looks `dominance_key` up if `prune_dominated` is set.
+        self.prune_dominated = prune_dominated
+
+        # the coordinates of every cell index.
+        self.cell_x = array("i", (maze.location(cell)[0] for cell in range(maze.width * maze.height)))
+        self.cell_y = array("i", (maze.location(cell)[1] for cell in range(maze.width * maze.height)))
+
+        # the all-pairs distance table for `true_distance_heuristic`, loaded on its first call.
+        self.distance_table = None
+        self.num_floor = sum(maze.floor)
+
+        self.packed = packed
+        self.start_state = self.canonical(maze.robotloc)
+        if packed:
+            self.start_state = self.pack(self.start_state)
+
+            # for each move (west, south, east, north): the bits of the cells whose neighbor
+            # that way is a floor, and how far (in cell indices) that neighbor is.
+            self.move_masks = []
+            for dx, dy in ((-1, 0), (0, -1), (1, 0), (0, 1)):
+                mask = 0
+                for cell in range(maze.width * maze.height):
+                    x, y = maze.location(cell)
+                    if maze.is_floor(x + dx, y + dy):
+                        mask |= 1 << cell
+                self.move_masks.append((mask, dx - dy * maze.width))
+
+            # the bits of every column of the maze, to find the largest x coordinate of a state.
+            self.column_masks = [sum(1 << maze.index(x, y) for y in range(maze.height)) for x in range(maze.width)]
+
     def __str__(self):
         string =  "Blind robot problem: "
-        string += "Possible start locations: " + str(self.start_state) + "\n"
+        string += "Possible start locations: " + str(self.unpack_path([self.start_state])[0]) + "\n"
         string += "Maze:\n" + str(self.maze) + "\n"
         return string
 
@@ -34,7 +78,7 @@ class SensorlessProblem():
         """
             Given a path, animate the robot following it.
         """
-        self.maze.robotloc = tuple(self.start_state)
+        self.maze.robotloc = tuple(self.unpack_path([self.start_state])[0])
 
         for state in path:
             print(str(self))
@@ -48,8 +92,10 @@ class SensorlessProblem():
             Given a state, returns True if it is a goal state,
             i.e. all the robot start locations have converged.
         """
-        _state = self._state(state)
-        return len(_state) == 1
+        if self.packed:
+            return bool(state) and not state & (state - 1)
+
+        return len(state) == 2
     
     def _state(self, state):
         """
@@ -64,13 +110,66 @@ class SensorlessProblem():
             
         return tuple(_state)    
     
-    def locate(self):
+    def canonical(self, state):
+        """
+            Return the canonical form of a tuple state: every location once, sorted by x, then y.
+        """
+        locations = sorted(set(zip(state[0::2], state[1::2])))
+        return tuple(coordinate for location in locations for coordinate in location)
+
+    def pack(self, state):
+        """
+            Pack a tuple state into an integer with one bit set for every possible location.
+        """
+        packed = 0
+        for i in range(0, len(state), 2):
+            packed |= 1 << self.maze.index(state[i], state[i + 1])
+        return packed
+
+    def cells(self, state):
+        """
+            Return the cell indices of the possible locations in a packed state.
+        """
+        cells = []
+        while state:
+            lowest = state & -state
+            cells.append(lowest.bit_length() - 1)
+            state ^= lowest
+        return cells
+
+    def dominance_key(self, state):
+        """
+            Return the possible locations of a state as a set of bits (as in a packed state).
+            A state whose bits are a subset of another's dominates it: moving the robot
+            the same way from both, every possible location of the first is also one of the second,
+            so any plan that localizes the robot from the second state also does from the first.
+        """
+        return state if self.packed else self.pack(state)
+
+    def locate(self, heuristic_fn=None, search_fn=astar_search, **search_args):
         """
             This method runs A* search on the current problem and returns the solution.
             I found it easier than having to call A* each time.
+            :arg heuristic_fn [optional]: the heuristic to search with. Defaults to `manhattan_heuristic`.
+            Pass `true_distance_heuristic` for a tighter bound, at the cost of building
+            the maze's all-pairs distance table first (slow and large on big mazes).
+            :arg search_fn [optional]: the search to run instead of A*, e.g. `weighted_astar_search`,
+            called as `search_fn(problem, heuristic_fn, **search_args)`.
         """
-        solution = astar_search(self, self.manhattan_heuristic)
+        if heuristic_fn is None:
+            heuristic_fn = self.manhattan_heuristic
+        solution = search_fn(self, heuristic_fn, **search_args)
+        solution.path = self.unpack_path(solution.path)
         return solution
+
+    def unpack_path(self, path):
+        """
+            Given a path of states, return it as a path of (x0, y0, x1, y1, ...) coordinate tuples.
+        """
+        if not self.packed:
+            return path
+        return [self.canonical([coordinate for cell in self.cells(state) for coordinate in self.maze.location(cell)])
+                for state in path]
     
     def get_final_position(self, path):
         """
@@ -88,30 +187,19 @@ class SensorlessProblem():
         """
         
         # Initialzie directions array,
-        # Step through the path, determine which direction 
-        # was taken at each successive step and append it to the array.
+        # Step through the path, determine which move turns each state
+        # into the next one and append its direction to the array.
+        # (Locations merge and are re-sorted, so robots cannot be compared one by one.)
         directions = []
-        
+        moves = (("W", -1, True, False), ("S", -1, False, True), ("E", 1, True, False), ("N", 1, False, True))
+
         for i in range(len(path)-1):
             state = path[i]
             next_state = path[i+1]
-            
-            for ix in range(0, len(state), 2):
-                
-                if next_state[ix] > state[ix]:
-                    directions.append("E")
-                    break
-                    
-                elif next_state[ix] < state[ix]:
-                    directions.append("W")
-                    break
-                
-                elif next_state[ix+1] > state[ix+1]:
-                    directions.append("N")
-                    break
-                
-                elif next_state[ix+1] < state[ix+1]:
-                    directions.append("S")
+
+            for direction, step, dir_x, dir_y in moves:
+                if self.move(state, step, dir_x=dir_x, dir_y=dir_y) == next_state:
+                    directions.append(direction)
                     break
 
         return directions
@@ -121,7 +209,9 @@ class SensorlessProblem():
         """
         Returns a list of (action, state, cost) tuples corresponding to edges in the graph.
         """
-        
+        if self.packed:
+            return self._packed_successors(state)
+
         # Initialzie successors, 
         # for each possible robot location, attempt to move it
         # in the appropriate direction.
@@ -142,6 +232,25 @@ class SensorlessProblem():
         # return compiled array of successors
         return successors
 
+    def _packed_successors(self, state):
+        """
+            `get_successors` for packed states. A move is a few operations on the whole state,
+            however many possible locations it has: the locations that can move are masked out,
+            shifted by the offset of the move, and merged back with the locations that stay.
+        """
+        successors = []
+        for mask, offset in self.move_masks:
+            moving = state & mask
+
+            # if no one moved, discard the state.
+            if not moving:
+                continue
+
+            moved = moving << offset if offset > 0 else moving >> -offset
+            successors.append((state ^ moving) | moved)
+
+        return successors
+
     
     def move(self, state, step, dir_x=False, dir_y=False):
         """
@@ -178,24 +287,44 @@ class SensorlessProblem():
             next_state.append(state[iy])
 
 
+        # merge robots that ended up in the same location.
+        next_state = self.canonical(next_state)
+
         # if no one moved, discard the state.
         if state == next_state:
             return None
             
-        #return immutable copy of the state.
-        return tuple(next_state)
+        return next_state
       
     def manhattan_heuristic(self, state):
         """
             Calculate the manhattan distance for the set of bots using the max and min x and y coordinates.
+            A move changes either every x or every y coordinate by at most 1, in the same direction,
+            so it shrinks the width plus the height of the box by at most 1: the heuristic is admissible.
         """
         
         # rather than using the normal Manhattan distance, box in all the robots
         # by finding the max and min coordinates in either both directions 
         # then using those to calculate the heuristic.
         max_x, max_y = 0, 0
-        min_x, min_y = 0, 0
+        min_x, min_y = self.maze.width, self.maze.height
         
+        if self.packed:
+            # an empty belief (a maze with no robots) has no box to measure.
+            if not state:
+                return 0
+
+            # rows are stored from the top, so the lowest set bit is in the highest row, and the highest in the lowest.
+            max_y = self.cell_y[(state & -state).bit_length() - 1]
+            min_y = self.cell_y[state.bit_length() - 1]
+            max_x = self.maze.width - 1
+            while not state & self.column_masks[max_x]:
+                max_x = max_x - 1
+            min_x = 0
+            while not state & self.column_masks[min_x]:
+                min_x = min_x + 1
+            return abs(max_x - min_x) + abs(max_y - min_y)
+
         for i in range(0, len(state), 2):
             ix, iy = i, i+1
             max_x = max(max_x, state[ix])
@@ -206,6 +335,42 @@ class SensorlessProblem():
                 
         return abs(max_x - min_x) + abs(max_y - min_y)
     
+    def true_distance_heuristic(self, state):
+        """
+            Estimate the remaining moves from the number of steps between two far-apart possible locations.
+            A move brings two locations at most 2 steps closer, so half their distance (rounded up)
+            is admissible; the heuristic returns the larger of that and `manhattan_heuristic`.
+
+            The distances come from the maze's all-pairs distance table (see `Maze.distance_table`).
+            Finding the two farthest locations exactly takes every pair; instead, the heuristic takes
+            the location `b` farthest from the first location, then the distance from `b` to the location
+            farthest from it, which takes two passes over the possible locations.
+            Locations that cannot reach each other can never merge: the state then gets UNREACHABLE.
+        """
+        if self.distance_table is None:
+            self.distance_table = self.maze.distance_table()
+        floor_numbers, table = self.distance_table
+        num_floor = self.num_floor
+
+        # (a maze file may start robots on walls; those locations are left out.)
+        if self.packed:
+            numbers = [floor_numbers[cell] for cell in self.cells(state) if floor_numbers[cell] >= 0]
+        else:
+            index = self.maze.index
+            numbers = [floor_numbers[index(state[i], state[i + 1])] for i in range(0, len(state), 2)
+                       if floor_numbers[index(state[i], state[i + 1])] >= 0]
+        if not numbers:
+            return self.manhattan_heuristic(state)
+
+        row = numbers[0] * num_floor
+        farthest = max(numbers, key=lambda number: table[row + number])
+        row = farthest * num_floor
+        distance = max(table[row + number] for number in numbers)
+
+        if distance == TABLE_UNREACHABLE:
+            return UNREACHABLE
+        return max((distance + 1) // 2, self.manhattan_heuristic(state))
+
     def manhattan_farthest(self, state):
         """
             Given a state, return the longest Manhattan distance between any two robots int he state.
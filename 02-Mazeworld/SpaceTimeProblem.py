@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""This module implements a SpaceTimeProblem data structure
+    to plan the path of a single robot around the space-time reservations of other robots.
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai", "Alberto Quattrini Li"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+from ReservationTable import ReservationTable
+
+# cost of one step when steps are also charged for conflicts: more than any path can have conflicts,
+# so that paths are still compared by length first, and by number of conflicts only on ties.
+CONFLICT_STEP_COST = 2**20
+
+
+class SpaceTimeProblem:
+    """
+        The problem of moving one robot from `start` to `goal` in a maze, where at every time step
+        the robot either waits or moves to an adjacent floor cell that is not reserved.
+
+        States are (x, y, t) tuples. Every step (a wait or a move) costs 1, and a goal state is one
+        where the robot is on its goal and can stay there for good, so the cost of a solution is
+        the time at which the robot arrives at its goal for the last time.
+
+        After the last reserved time, the maze no longer changes: only robots parked on their goals
+        remain. The time of every later state is therefore capped at `steady_time`, so the states
+        are finite, and a search for a robot that cannot reach its goal ends instead of waiting forever.
+
+        An optional second table of reservations (`avoid`) holds soft reservations: the robot may
+        break them, but among its shortest paths it takes one that breaks the fewest.
+    """
+
+    def __init__(self, maze, start, goal, reservations=None, avoid=None):
+        """
+            Constructor.
+            :arg maze: the Maze to navigate.
+            :arg start: the (x, y) location of the robot at time 0.
+            :arg goal: the (x, y) location the robot must reach.
+            :arg reservations [optional]: the ReservationTable to plan around. Defaults to an empty one.
+            :arg avoid [optional]: a ReservationTable of soft reservations to break as little as possible.
+        """
+        self.maze = maze
+        self.goal = goal
+        self.reservations = ReservationTable() if reservations is None else reservations
+        self.start_state = (start[0], start[1], 0)
+        self.goal_distances = maze.distance_map(goal[0], goal[1])
+        self.avoid = avoid
+
+        self.steady_time = self.reservations.last_time + 1
+        self.unit_cost = 1
+        if avoid is not None:
+            self.steady_time = max(self.steady_time, avoid.last_time + 1)
+            self.unit_cost = CONFLICT_STEP_COST
+
+    def __str__(self):
+        string = "Space-time problem:\n"
+        string += "Start: " + str(self.start_state[:2]) + ", goal: " + str(self.goal) + "\n"
+        string += "Reservations: " + str(len(self.reservations)) + "\n"
+        return string
+
+    def get_successors(self, state):
+        """
+            Returns the states reachable in one time step: waiting in place, or moving to a neighboring floor cell.
+        """
+        x, y, t = state
+        next_t = min(t + 1, self.steady_time)
+
+        reservations = self.reservations
+        successors = []
+        if reservations.is_free(x, y, next_t):
+            successors.append((x, y, next_t))
+        for next_x, next_y in self.maze.floor_neighbors(x, y):
+            if reservations.can_move(x, y, next_x, next_y, t):
+                successors.append((next_x, next_y, next_t))
+
+        return successors
+
+    def step_cost(self, state, next_state):
+        """
+            Every step costs one unit, plus 1 if it breaks a soft reservation.
+        """
+        if self.avoid is None:
+            return 1
+
+        x, y, t = state
+        next_x, next_y, next_t = next_state
+        if (x, y) == (next_x, next_y):
+            conflict = not self.avoid.is_free(x, y, next_t)
+        else:
+            conflict = not self.avoid.can_move(x, y, next_x, next_y, t)
+        return self.unit_cost + conflict
+
+    def is_goal(self, state):
+        x, y, t = state
+        return (x, y) == self.goal and self.reservations.can_park(x, y, t)
+
+    def true_distance_heuristic(self, state):
+        """
+            The wall-aware distance from the robot's location to its goal, ignoring other robots.
+        """
+        return self.goal_distances[self.maze.index(state[0], state[1])] * self.unit_cost
+
+    def location_path(self, path):
+        """
+            Given a path of (x, y, t) states, return the (x, y) location of the robot at every time step.
+        """
+        return [(x, y) for x, y, t in path]
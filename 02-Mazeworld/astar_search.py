@@ -6,6 +6,9 @@
     from the source to the current node and a precomputed heuristic
     estimate of the shortest distance from shortest distance from the
     current node to the desired goal state.
+    It also implements Partial Expansion A*, which stores fewer nodes on problems with many successors,
+    and three searches that trade optimality for speed: weighted A*, Anytime Repairing A* (ARA*)
+    and focal search, all of which bound how far their solutions are from optimal.
 """
 __author__ = "Amittai"
 __copyright__ = "Copyright 2021"
@@ -13,129 +16,345 @@ __credits__ = ["Amittai", "Alberto Quattrini Li"]
 __email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
 __github__ = "@siavava"
 
+from array import array
+from heapq import heapify, heappush, heappop
+from itertools import count
+from time import perf_counter
+
 from SearchSolution import SearchSolution
-from PriorityQueue import PriorityQueue
-
-# define global constant for infinite weight
-INFINITY = 2**20
-
-class AstarNode:
-    # each search node except the root has a parent node
-    # and all search nodes wrap a state object
-
-    def __init__(self, state, heuristic, parent=None, transition_cost=0):
-        self.state = state
-        self.heuristic = heuristic
-        self.parent = parent
-        self.transition_cost = transition_cost
-        
-
-    def priority(self):
-        """Return the current Node's priority value.
-            This value is the sum of the transition cost
-            to the Node and the heuristic estimating distance
-            to the goal state.
-        """
-        return self.heuristic + self.transition_cost
-
-    # Comparators for the heapq module.
-    # These functions are used ot devise an ordering for AstarNode instances,
-    # in order to arrange them in the priority queue.
-    def __gt__(self, other):
-        return self.priority() > other.priority()
-    
-    def __lt__(self, other):
-        return self.priority() < other.priority()
-    
-    def __eq__(self, other):
-        return self.priority() == other.priority()
-    
-    def __ge__(self, other):
-        return self.priority() >= other.priority()
-    
-    def __le__(self, other):
-        return self.priority() <= other.priority()
-    
-
-def backchain(node):
+from graph_search import graph_search, backchain, PriorityFrontier, IndexedPriorityFrontier, INFINITY
+
+
+def astar_search(search_problem, heuristic_fn, tie_breaking="high_g", indexed=False):
+    """Run A* search on the search problem with the specified heuristic function.
+        A* is the generic graph search (see [./graph_search.py]) with a frontier
+        ordered by transition cost plus heuristic estimate.
+        :arg tie_breaking: how to order states with equal priority; see `PriorityFrontier`.
+            Defaults to preferring the state with the larger transition cost.
+        :arg indexed [optional]: if True, update the frontier entries of states reached again at a lower cost
+            in place (see `IndexedPriorityFrontier`), rather than leaving stale entries in the heap.
+            The search and its solution are the same either way; the indexed frontier holds fewer
+            entries, but its heap runs in Python rather than in `heapq`'s C code. Defaults to False.
     """
-        Backtrack and rebuild the path generated by the search.
+    frontier_class = IndexedPriorityFrontier if indexed else PriorityFrontier
+    return graph_search(search_problem, frontier_class(heuristic_fn, tie_breaking=tie_breaking),
+                        "Astar with heuristic " + heuristic_fn.__name__)
+
+
+def partial_expansion_astar_search(search_problem, heuristic_fn):
+    """Run Partial Expansion A* (PEA*) on the search problem with the specified heuristic function.
+
+        Plain A* stores every successor of an expanded node, although most of them have a
+        higher f-value than the solution and are never expanded. PEA* instead stores only the
+        successors whose f-value equals the stored value F of the expanded node, then puts the
+        node back into the queue with F raised to the smallest f-value among the successors it
+        left out, to be expanded again only if the search gets that far.
+        The search returns optimal solutions, like A*, while storing far fewer nodes
+        (see `solution.nodes_generated`) when states have many successors, e.g. with many robots.
     """
-    
-    # initialize an array to hold the sequence of states in the path.
-    result = []
-    current = node
-    
-    # backtrack until the root node is reached, 
-    # i.e. a node is found whose predecessor is None.
-    while current:
-        
-        # append states to the path.
-        result.append(current.state)
-        current = current.parent
-
-    # reverse the path to get the correct order, and return the result.
-    result.reverse()
-    return result
-
-
-def astar_search(search_problem, heuristic_fn):
-    """Run A* search on the search problem with the specified heuristic function."""
-    
+
     # initialize the handler for the search solution.
-    solution = SearchSolution(search_problem, "Astar with heuristic " + heuristic_fn.__name__)
-    
-    # initialize the start node and priority queue,
-    # then push the start node into the queue.
-    start_node = AstarNode(search_problem.start_state, heuristic_fn(search_problem.start_state))
-    queue = PriorityQueue()
-    queue.push(start_node)
-
-    # initilize a dictionary to hold states and associated costs
-    # to avoid evaluating paths that have been superseded by lesser-cost paths.
-    visited_cost = {}
-    visited_cost[start_node.state] = 0
-
-    # while priority queue is not empty (i.e. there are still nodes to explore)...
+    solution = SearchSolution(search_problem, "Partial expansion Astar with heuristic " + heuristic_fn.__name__)
+    step_cost = getattr(search_problem, "step_cost", None)
+
+    # the search tree is stored in parallel lists, as in the generic graph search.
+    start_state = search_problem.start_state
+    node_states = [start_state]
+    node_costs = [0]
+    node_parents = array("i", [-1])
+    best_cost = {start_state: 0}
+
+    # queue entries are (F, -g, -count, node) tuples: the stored value, ties going to deeper nodes,
+    # then to the most recently pushed, as in the "high_g" frontier of the generic graph search.
+    counter = count()
+    queue = [(heuristic_fn(start_state), 0, -next(counter), 0)]
+
     while queue:
-        
-        # get node in front of priority queue and check it's state.
-        current_node = queue.pop()
-        current_state = current_node.state
-        
-        # if the node has been superseded by another node (for the same state) 
-        # that had a lesser cost, skip the current node
-        # and proceed to the next node in the queue.
-        if visited_cost[current_state] != current_node.transition_cost:
+        solution.max_frontier = max(solution.max_frontier, len(queue))
+
+        # get node in front of the queue and check its state.
+        stored_value, _, _, node = heappop(queue)
+        current_state = node_states[node]
+        current_cost = node_costs[node]
+
+        # skip nodes superseded by a lesser-cost node for the same state.
+        if best_cost[current_state] < current_cost:
             continue
-            
+
         solution.nodes_visited = solution.nodes_visited + 1
-        
-        # if current state the goal state, backtrack and rebuild the path.
+
+        # if current state is the goal state, backtrack and rebuild the path.
         if search_problem.is_goal(current_state):
-            solution.cost = visited_cost[current_state]
-            solution.path = backchain(current_node)
+            solution.cost = current_cost
+            solution.path = backchain(node, node_states, node_parents)
             break
-        
-        # if current node is not the goal state:
-        #   1. get cost of current state and compute cost for next state.
-        current_cost = current_node.transition_cost
-        next_cost = current_cost + 1
-        
-        #   2. get all possible next states for the current state
-        #   3. for each next state, calculate the cost of the transition 
-        #      using the cost to current, transition cost, and heuristic and cost to current.
+
+        # store the successors that belong at the current stored value,
+        # and find the next stored value among those that do not.
+        next_value = INFINITY
         for next_state in search_problem.get_successors(current_state):
-        
-            #   4. if a node's new cost is more favorable than its current cost,
-            #      save the new cost to the costs dictionary and push it into the priority queue.
-            if visited_cost.get(next_state, INFINITY) > next_cost:
-                visited_cost[next_state] = next_cost
-                next_node = AstarNode(next_state, heuristic_fn(next_state),
-                                      parent=current_node, transition_cost=next_cost)
-                queue.push(next_node)
-                
-
-    # once the priority queue is empty or an exit occurs 
-    # (i.e. a goal state has been found), return the solution.
+            next_cost = current_cost + (1 if step_cost is None else step_cost(current_state, next_state))
+            if best_cost.get(next_state, INFINITY) <= next_cost:
+                continue
+
+            next_f = next_cost + heuristic_fn(next_state)
+            if next_f <= stored_value:
+                best_cost[next_state] = next_cost
+                node_states.append(next_state)
+                node_costs.append(next_cost)
+                node_parents.append(node)
+                heappush(queue, (next_f, -next_cost, -next(counter), len(node_states) - 1))
+                solution.nodes_generated = solution.nodes_generated + 1
+            else:
+                next_value = min(next_value, next_f)
+
+        # if some successors were left out, put the node back to be re-expanded at their value.
+        if next_value < INFINITY:
+            heappush(queue, (next_value, -current_cost, -next(counter), node))
+
+    # once the queue is empty or a goal state has been found, return the solution.
+    return solution
+
+
+def weighted_astar_search(search_problem, heuristic_fn, weight=2, tie_breaking="high_g"):
+    """Run weighted A* on the search problem: A* with priorities g + weight * h.
+        Inflating the heuristic makes the search greedier, so it usually finds a solution after
+        expanding far fewer nodes. With an admissible heuristic, the solution costs at most
+        `weight` times the optimal cost; `solution.suboptimality` records that bound.
+        :arg weight [optional]: the factor to inflate the heuristic by, at least 1. Defaults to 2.
+        :arg tie_breaking: how to order states with equal priority; see `PriorityFrontier`.
+    """
+    if weight < 1:
+        raise ValueError(f"Heuristic weight must be at least 1, got {weight}.")
+
+    def weighted_heuristic(state):
+        return weight * heuristic_fn(state)
+
+    solution = graph_search(search_problem, PriorityFrontier(weighted_heuristic, tie_breaking=tie_breaking),
+                            "Weighted Astar (w = {}) with heuristic {}".format(weight, heuristic_fn.__name__))
+    solution.suboptimality = weight
+    return solution
+
+
+def _state_path(state, parents):
+    """Follow the parent links of a state back to the root, and return the path from the root to it.
+    """
+    path = []
+    while state is not None:
+        path.append(state)
+        state = parents[state]
+    path.reverse()
+    return path
+
+
+def ara_star_search(search_problem, heuristic_fn, time_limit=1.0, weight=3, weight_step=0.5):
+    """Run Anytime Repairing A* (ARA*) on the search problem with the specified heuristic function.
+
+        ARA* runs a series of weighted A* searches, lowering the weight after each one, and returns
+        the best solution found when the time is up or the weight reaches 1 (an optimal solution).
+        Rather than starting over, each search reuses the costs found by the ones before it:
+        states whose cost improves after they were expanded are set aside as inconsistent
+        instead of being expanded again in the same search, and seed the frontier of the next one.
+        A search stops as soon as no state on its frontier can lead to a cheaper solution.
+
+        The time limit only stops the search once it has found a solution, so it always
+        returns one if there is one. Every improvement is recorded in `solution.improvements`,
+        and `solution.suboptimality` bounds how far the final solution is from optimal.
+        :arg time_limit [optional]: the seconds to spend improving the solution. Defaults to 1.
+        :arg weight [optional]: the weight of the heuristic in the first search. Defaults to 3.
+        :arg weight_step [optional]: how much to lower the weight after each search. Defaults to 0.5.
+    """
+
+    # initialize the handler for the search solution.
+    solution = SearchSolution(search_problem, "ARA* with heuristic " + heuristic_fn.__name__)
+    step_cost = getattr(search_problem, "step_cost", None)
+    start_time = perf_counter()
+
+    # the lowest cost found for every state, and the state it was reached from.
+    start_state = search_problem.start_state
+    best_cost = {start_state: 0}
+    parents = {start_state: None}
+
+    # the best solution so far, with its cost.
+    solution_path = None
+    solution_cost = INFINITY
+    if search_problem.is_goal(start_state):
+        solution_path, solution_cost = [start_state], 0
+
+    # the frontier maps every open state to the cost it was queued with; queue entries are
+    # (g + weight * h, -g, -count, state), ties going to deeper, then more recent states;
+    # they are stale if the state was queued again since.
+    counter = count()
+    frontier = {start_state: 0}
+    queue = [(weight * heuristic_fn(start_state), 0, -next(counter), start_state)]
+    expanded = set()
+    inconsistent = set()
+
+    while True:
+
+        # run weighted A* until no state on the frontier can improve on the current solution.
+        while queue and queue[0][0] < solution_cost:
+            if solution_path is not None and perf_counter() - start_time > time_limit:
+                break
+            solution.max_frontier = max(solution.max_frontier, len(queue))
+
+            _, negative_cost, _, current_state = heappop(queue)
+            if frontier.get(current_state) != -negative_cost:
+                continue
+            del frontier[current_state]
+            expanded.add(current_state)
+            current_cost = best_cost[current_state]
+            solution.nodes_visited = solution.nodes_visited + 1
+
+            for next_state in search_problem.get_successors(current_state):
+                next_cost = current_cost + (1 if step_cost is None else step_cost(current_state, next_state))
+                if best_cost.get(next_state, INFINITY) <= next_cost:
+                    continue
+                best_cost[next_state] = next_cost
+                parents[next_state] = current_state
+
+                # a goal needs no expanding: it is the best solution so far.
+                if search_problem.is_goal(next_state):
+                    if next_cost < solution_cost:
+                        solution_path, solution_cost = _state_path(next_state, parents), next_cost
+                elif next_state in expanded:
+                    inconsistent.add(next_state)
+                else:
+                    frontier[next_state] = next_cost
+                    heappush(queue, (next_cost + weight * heuristic_fn(next_state), -next_cost, -next(counter), next_state))
+                    solution.nodes_generated = solution.nodes_generated + 1
+
+        if solution_path is None:
+            break
+
+        # the optimal cost is at least the least unweighted f-value of any state left to expand.
+        lower_bound = min([best_cost[state] + heuristic_fn(state) for state in frontier]
+                          + [best_cost[state] + heuristic_fn(state) for state in inconsistent]
+                          + [solution_cost])
+        if lower_bound == solution_cost:
+            suboptimality = 1
+        else:
+            suboptimality = min(weight, solution_cost / lower_bound) if lower_bound > 0 else weight
+
+        # record the solution, or the tighter bound on the same solution.
+        seconds = perf_counter() - start_time
+        if solution.improvements and solution.improvements[-1][1] == solution_cost:
+            seconds = solution.improvements.pop()[0]
+        solution.improvements.append((seconds, solution_cost, suboptimality))
+
+        if suboptimality <= 1 or perf_counter() - start_time > time_limit:
+            break
+
+        # lower the weight, and queue the frontier and the inconsistent states again with it.
+        weight = max(1, weight - weight_step)
+        for state in inconsistent:
+            frontier[state] = best_cost[state]
+        inconsistent = set()
+        expanded = set()
+        queue = [(cost + weight * heuristic_fn(state), -cost, -next(counter), state) for state, cost in frontier.items()]
+        heapify(queue)
+
+    if solution_path is not None:
+        solution.path = solution_path
+        solution.cost = solution_cost
+        solution.suboptimality = solution.improvements[-1][2]
+    return solution
+
+
+def focal_search(search_problem, heuristic_fn, weight=2, focal_heuristic_fn=None):
+    """Run focal search (A*-epsilon) on the search problem with the specified heuristic function.
+
+        Like A*, focal search keeps the frontier ordered by f = g + h, but it may expand any node in the
+        focal list: the frontier nodes with f at most `weight` times the least f on the frontier.
+        Among those it expands the one that `focal_heuristic_fn` rates closest to a goal, which usually
+        reaches a goal much sooner. With an admissible heuristic, the solution costs at most
+        `weight` times the optimal cost; `solution.suboptimality` records that bound.
+        :arg weight [optional]: the suboptimality bound, at least 1. Defaults to 2.
+        :arg focal_heuristic_fn [optional]: the estimate used to pick among the focal nodes;
+            it need not be admissible. Defaults to `heuristic_fn`.
+    """
+    if weight < 1:
+        raise ValueError(f"Suboptimality bound must be at least 1, got {weight}.")
+    if focal_heuristic_fn is None:
+        focal_heuristic_fn = heuristic_fn
+
+    # initialize the handler for the search solution.
+    solution = SearchSolution(search_problem, "Focal search (w = {}) with heuristic {}".format(weight, heuristic_fn.__name__))
+    step_cost = getattr(search_problem, "step_cost", None)
+
+    # the search tree is stored in parallel lists, as in the generic graph search,
+    # with the f-value of every node and whether it has been expanded.
+    start_state = search_problem.start_state
+    node_states = [start_state]
+    node_costs = [0]
+    node_parents = array("i", [-1])
+    node_values = [heuristic_fn(start_state)]
+    node_expanded = bytearray(1)
+    best_cost = {start_state: 0}
+
+    # every frontier node is on the open queue, ordered by f to find the least f-value, and either
+    # on the focal queue, ordered by the focal heuristic, or waiting, ordered by f, until the bound reaches it.
+    # Focal entries are (focal estimate, f, -g, -count, node) tuples, the others (f, -count, node),
+    # so remaining ties go to the most recent node; nodes that have been expanded or superseded are skipped.
+    counter = count()
+    open_queue = [(node_values[0], -next(counter), 0)]
+    focal_queue = [(focal_heuristic_fn(start_state), node_values[0], 0, -next(counter), 0)]
+    waiting_queue = []
+
+    def is_stale(node):
+        return node_expanded[node] or best_cost[node_states[node]] < node_costs[node]
+
+    while True:
+
+        # find the least f-value on the frontier, and move the waiting nodes within the bound to the focal list.
+        while open_queue and is_stale(open_queue[0][2]):
+            heappop(open_queue)
+        if not open_queue:
+            break
+        bound = weight * open_queue[0][0]
+        while waiting_queue and waiting_queue[0][0] <= bound:
+            _, tiebreak, node = heappop(waiting_queue)
+            heappush(focal_queue, (focal_heuristic_fn(node_states[node]), node_values[node], -node_costs[node], tiebreak, node))
+
+        solution.max_frontier = max(solution.max_frontier, len(open_queue))
+
+        # expand the focal node rated closest to a goal. The node with the least f-value
+        # is always within the bound, so the focal list cannot run out before the frontier.
+        node = heappop(focal_queue)[4]
+        if is_stale(node):
+            continue
+        node_expanded[node] = 1
+        current_state = node_states[node]
+        current_cost = node_costs[node]
+        solution.nodes_visited = solution.nodes_visited + 1
+
+        # if current state is the goal state, backtrack and rebuild the path.
+        if search_problem.is_goal(current_state):
+            solution.cost = current_cost
+            solution.path = backchain(node, node_states, node_parents)
+            solution.suboptimality = weight
+            break
+
+        for next_state in search_problem.get_successors(current_state):
+            next_cost = current_cost + (1 if step_cost is None else step_cost(current_state, next_state))
+            if best_cost.get(next_state, INFINITY) <= next_cost:
+                continue
+            best_cost[next_state] = next_cost
+            next_value = next_cost + heuristic_fn(next_state)
+            node_states.append(next_state)
+            node_costs.append(next_cost)
+            node_parents.append(node)
+            node_values.append(next_value)
+            node_expanded.append(0)
+
+            next_node = len(node_states) - 1
+            tiebreak = -next(counter)
+            heappush(open_queue, (next_value, tiebreak, next_node))
+            if next_value <= bound:
+                heappush(focal_queue, (focal_heuristic_fn(next_state), next_value, -next_cost, tiebreak, next_node))
+            else:
+                heappush(waiting_queue, (next_value, tiebreak, next_node))
+            solution.nodes_generated = solution.nodes_generated + 1
+
+    # once the frontier is empty or a goal state has been found, return the solution.
     return solution
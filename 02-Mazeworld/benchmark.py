@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""This file benchmarks the A* frontiers implemented in this directory.
+
+    Run it to compare A* with lazy deletion (stale heap entries are skipped when popped)
+    against A* with an indexed frontier (entries are updated in place with `decrease_key`),
+    on Mazeworld and Sensorless problems, e.g. `python benchmark.py --csv results.csv`.
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+import csv
+from argparse import ArgumentParser
+from time import perf_counter
+
+from Maze import Maze
+from MazeworldProblem import MazeworldProblem
+from SensorlessProblem import SensorlessProblem
+from astar_search import astar_search
+
+# the frontiers to compare, by name, with the arguments that select them.
+FRONTIERS = {
+    "lazy": {"indexed": False},
+    "indexed": {"indexed": True},
+}
+
+
+def mazeworld_problems():
+    """Build the Mazeworld problems to benchmark, each with the heuristic to search it with.
+        :return: a list of (name, search problem, heuristic) tuples.
+    """
+    problems = []
+    for name, goal in (("maze4", (22, 1, 17, 2)),
+                       ("maze5", (13, 13, 1, 13, 13, 1, 1, 1)),
+                       ("maze6", (13, 13, 1, 13, 13, 1, 1, 1)),
+                       ("maze10", (2, 1, 3, 1, 1, 2, 2, 2, 3, 2, 1, 3, 2, 3, 3, 3))):
+        problem = MazeworldProblem(Maze("mazes/" + name + ".maz"), goal)
+        problems.append((name, problem, problem.manhattan_heuristic))
+    return problems
+
+
+def sensorless_problems():
+    """Build the Sensorless problems to benchmark, each with the heuristic to search it with.
+        :return: a list of (name, search problem, heuristic) tuples.
+    """
+    problems = []
+    for name in ("maze4", "maze6", "maze9"):
+        problem = SensorlessProblem(Maze("mazes/" + name + ".maz"), packed=True)
+        problems.append(("sensorless " + name, problem, problem.true_distance_heuristic))
+    return problems
+
+
+# columns of the benchmark results, in order.
+FIELDS = ["problem", "frontier", "seconds", "nodes_visited", "nodes_generated", "max_frontier", "cost"]
+
+
+def run_benchmarks(problems, frontiers=FRONTIERS):
+    """Run A* with every frontier on every problem.
+        :arg problems: a list of (name, search problem, heuristic) tuples.
+        :arg frontiers: a dictionary mapping names to keyword arguments of `astar_search`.
+        :return: a list of result rows, each a dictionary keyed by the names in FIELDS.
+    """
+    rows = []
+    for name, problem, heuristic in problems:
+        for frontier, kwargs in frontiers.items():
+            start_time = perf_counter()
+            solution = astar_search(problem, heuristic, **kwargs)
+            seconds = perf_counter() - start_time
+            rows.append({
+                "problem": name,
+                "frontier": frontier,
+                "seconds": seconds,
+                "nodes_visited": solution.nodes_visited,
+                "nodes_generated": solution.nodes_generated,
+                "max_frontier": solution.max_frontier,
+                "cost": solution.cost,
+            })
+    return rows
+
+
+def write_csv(rows, filename):
+    """Write benchmark results to a CSV file, one row per (problem, frontier) run.
+    """
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_rows(rows):
+    """Print benchmark results as a table.
+    """
+    print("{:<20s} {:<8s} {:>9s} {:>10s} {:>10s} {:>9s} {:>6s}".format(
+        "problem", "frontier", "seconds", "visited", "generated", "frontier", "cost"))
+    for row in rows:
+        print("{:<20s} {:<8s} {:>9.4f} {:>10d} {:>10d} {:>9d} {:>6}".format(
+            row["problem"], row["frontier"], row["seconds"], row["nodes_visited"],
+            row["nodes_generated"], row["max_frontier"], row["cost"]))
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compare A* with lazy deletion against A* with an indexed frontier.")
+    parser.add_argument("--csv", help="file to write results to, as CSV")
+    parser.add_argument("--mazeworld-only", action="store_true", help="skip the Sensorless problems")
+    args = parser.parse_args()
+
+    problems = mazeworld_problems()
+    if not args.mazeworld_only:
+        problems += sensorless_problems()
+
+    results = run_benchmarks(problems)
+    print_rows(results)
+    if args.csv:
+        write_csv(results, args.csv)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""This module implements a generic Graph Search core, shared by BFS, DFS, UCS and A*.
+    The algorithms differ only in the frontier that decides which node is expanded next:
+    a FIFO queue gives BFS, a LIFO stack gives DFS, and a priority queue gives UCS and A*.
+
+    The same file is kept in 01-SearchProblems and 02-Mazeworld, so each assignment runs on its own:
+    edit both copies together (`make check` fails if they differ).
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai", "Alberto Quattrini Li"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+from array import array
+from collections import deque
+from heapq import heappush, heappop
+from itertools import count
+
+from PriorityQueue import IndexedPriorityQueue
+from SearchSolution import SearchSolution
+
+# define global constant for infinite weight
+INFINITY = float("inf")
+
+
+class FIFOFrontier:
+    """
+        A first-in, first-out frontier. Searching with it gives Breadth-First Search.
+    """
+    def __init__(self):
+        self._queue = deque()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def push(self, node, cost, state):
+        self._queue.append(node)
+
+    def pop(self):
+        return self._queue.popleft()
+
+
+class LIFOFrontier:
+    """
+        A last-in, first-out frontier. Searching with it gives (graph) Depth-First Search.
+    """
+    def __init__(self):
+        self._stack = []
+
+    def __len__(self):
+        return len(self._stack)
+
+    def push(self, node, cost, state):
+        self._stack.append(node)
+
+    def pop(self):
+        return self._stack.pop()
+
+
+class PriorityFrontier:
+    """
+        A frontier that pops the node with the lowest cost plus heuristic estimate first.
+        With no heuristic, searching with it gives Uniform-Cost Search; with one, it gives A*.
+
+        Entries are plain `(priority, tiebreak, count, node)` tuples, so every heap comparison
+        runs in C rather than through Python comparison methods. Ties in priority are broken
+        deterministically according to `tie_breaking`:
+            "high_g" [default]: prefer the node with the larger cost so far, i.e. the deeper one.
+                On mazes with many equal-priority states this dives towards the goal
+                instead of widening the search over the whole plateau.
+            "low_g": prefer the node with the smaller cost so far.
+            "lifo": prefer the most recently pushed node.
+            "fifo": prefer the least recently pushed node.
+        Remaining ties (e.g. equal cost with "high_g") go to the most recently pushed node.
+    """
+    TIE_BREAKING = ("high_g", "low_g", "lifo", "fifo")
+
+    def __init__(self, heuristic_fn=None, tie_breaking="high_g"):
+        if tie_breaking not in self.TIE_BREAKING:
+            raise ValueError(f"Unknown tie-breaking policy {tie_breaking!r}; expected one of {self.TIE_BREAKING}.")
+        self.heuristic_fn = heuristic_fn
+        self._heap = []
+        self._counter = count()
+        self._cost_sign = {"high_g": -1, "low_g": 1}.get(tie_breaking, 0)
+        self._count_sign = 1 if tie_breaking == "fifo" else -1
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, node, cost, state):
+        priority = cost if self.heuristic_fn is None else cost + self.heuristic_fn(state)
+        heappush(self._heap, (priority, self._cost_sign * cost, self._count_sign * next(self._counter), node))
+
+    def pop(self):
+        return heappop(self._heap)[3]
+
+
+class IndexedPriorityFrontier(PriorityFrontier):
+    """
+        A PriorityFrontier that holds at most one entry per state.
+        When a cheaper path to a state still in the frontier is found, the state's entry is updated
+        in place with `decrease_key`, instead of pushing a second entry and leaving the stale one
+        in the heap until it is popped and skipped (lazy deletion).
+        Nodes are popped in the same order as with a PriorityFrontier, with the same tie-breaking.
+    """
+    def __init__(self, heuristic_fn=None, tie_breaking="high_g"):
+        super().__init__(heuristic_fn, tie_breaking)
+        self._queue = IndexedPriorityQueue()
+
+    def __len__(self):
+        return len(self._queue)
+
+    def push(self, node, cost, state):
+        priority = cost if self.heuristic_fn is None else cost + self.heuristic_fn(state)
+        entry = (priority, self._cost_sign * cost, self._count_sign * next(self._counter), node)
+
+        # a cheaper path to the same state has the same heuristic estimate, so its entry always sorts first.
+        if state in self._queue:
+            self._queue.decrease_key(state, entry)
+        else:
+            self._queue.push(state, entry)
+
+    def pop(self):
+        return self._queue.pop()[1][3]
+
+
+def backchain(node, node_states, node_parents):
+    """
+        Backtrack from `node` to the root and rebuild the path generated by the search, in O(path length).
+    """
+
+    # append states while walking up the parent links, then reverse to get the correct order.
+    path = []
+    while node != -1:
+        path.append(node_states[node])
+        node = node_parents[node]
+    path.reverse()
+    return path
+
+
+# states with at most this many bits in their dominance key are checked by looking up every subset of the key.
+SUBSET_LOOKUP_BITS = 10
+
+
+def _dominated(key, cost, expanded_keys, expanded_groups):
+    """Check if some expanded state, reached at no greater cost, has a dominance key that is a subset of `key`.
+        Small keys look up each of their subsets in `expanded_keys`, a map from key to cost.
+        Larger keys scan `expanded_groups`, the expanded keys grouped by their lowest set bit,
+        which any subset of `key` must have among its own bits.
+    """
+    if bin(key).count("1") <= SUBSET_LOOKUP_BITS:
+        subset = key
+        while subset:
+            if expanded_keys.get(subset, INFINITY) <= cost:
+                return True
+            subset = (subset - 1) & key
+        return False
+
+    bits = key
+    while bits:
+        lowest = bits & -bits
+        for expanded_key in expanded_groups.get(lowest, ()):
+            if expanded_keys[expanded_key] <= cost and expanded_key & ~key == 0:
+                return True
+        bits ^= lowest
+    return False
+
+
+def graph_search(search_problem, frontier, search_method):
+    """Run a graph search on any problem exposing `start_state`, `get_successors` and `is_goal`.
+        Every step costs 1, unless the problem defines `step_cost(state, next_state)`.
+        If the problem defines `dominance_key(state)`, returning an integer bitset such that a state
+        is at least as close to a goal as any state whose key is a superset of its own, states dominated
+        by an already expanded state (at no greater cost) are skipped; they are counted in `nodes_pruned`.
+        A problem can turn this off by setting its `prune_dominated` attribute to False.
+        :arg search_problem: the search problem.
+        :arg frontier: an empty FIFOFrontier, LIFOFrontier, PriorityFrontier or IndexedPriorityFrontier.
+        :arg search_method: the name of the search, for the solution's report.
+        :return solution: a SearchSolution instance carrying information about the search run.
+    """
+
+    # initialize the handler for the search solution.
+    solution = SearchSolution(search_problem, search_method)
+    step_cost = getattr(search_problem, "step_cost", None)
+
+    # the search tree is stored in parallel lists: node `i` wraps the state `node_states[i]`,
+    # was reached at cost `node_costs[i]`, and has the parent node `node_parents[i]` (-1 for the root).
+    start_state = search_problem.start_state
+    node_states = [start_state]
+    node_costs = [0]
+    node_parents = array("i", [-1])
+
+    # a dictionary holds the lowest cost found for every state, to avoid evaluating paths
+    # that have been superseded by lesser-cost paths.
+    best_cost = {start_state: 0}
+    frontier.push(0, 0, start_state)
+
+    # the dominance keys of expanded states with their costs, and grouped by their lowest set bit (see `_dominated`).
+    dominance_key = getattr(search_problem, "dominance_key", None)
+    if not getattr(search_problem, "prune_dominated", True):
+        dominance_key = None
+    expanded_keys = {}
+    expanded_groups = {}
+
+    # while the frontier is not empty (i.e. there are still nodes to explore)...
+    while frontier:
+        solution.max_frontier = max(solution.max_frontier, len(frontier))
+
+        # get the next node and check its state.
+        node = frontier.pop()
+        current_state = node_states[node]
+        current_cost = node_costs[node]
+
+        # if the node has been superseded by another node (for the same state)
+        # that had a lesser cost, skip it.
+        if best_cost[current_state] < current_cost:
+            continue
+
+        # if the node is dominated by a node that has already been expanded, skip it as well.
+        if dominance_key is not None:
+            key = dominance_key(current_state)
+            if _dominated(key, current_cost, expanded_keys, expanded_groups):
+                solution.nodes_pruned = solution.nodes_pruned + 1
+                continue
+            expanded_keys[key] = current_cost
+            expanded_groups.setdefault(key & -key, []).append(key)
+
+        solution.nodes_visited = solution.nodes_visited + 1
+
+        # if current state is the goal state, backtrack and rebuild the path.
+        if search_problem.is_goal(current_state):
+            solution.cost = current_cost
+            solution.path = backchain(node, node_states, node_parents)
+            break
+
+        # otherwise, add every successor that improves on its best known cost to the tree and the frontier.
+        for next_state in search_problem.get_successors(current_state):
+            next_cost = current_cost + (1 if step_cost is None else step_cost(current_state, next_state))
+            if best_cost.get(next_state, INFINITY) > next_cost:
+                best_cost[next_state] = next_cost
+                node_states.append(next_state)
+                node_costs.append(next_cost)
+                node_parents.append(node)
+                frontier.push(len(node_states) - 1, next_cost, next_state)
+                solution.nodes_generated = solution.nodes_generated + 1
+
+    # once the frontier is empty or an exit occurs
+    # (i.e. a goal state has been found), return the solution.
+    return solution
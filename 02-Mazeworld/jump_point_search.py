@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""This module implements Jump Point Search (JPS) for single-robot Mazeworld problems.
+
+    On a grid, many shortest paths are symmetric: they take the same steps in a different order.
+    JPS searches only one of them, in canonical order: from every expanded cell it moves in a straight
+    line, and stops only at jump points, the cells where the path may have to turn (next to a wall
+    corner) or the goal. A* then expands jump points only, instead of every cell of every corridor.
+    Runs are looked up in the maze's precomputed jump tables (JPS+, see `Maze.jump_table`)
+    rather than walked cell by cell, so each successor costs O(1) to find.
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai", "Alberto Quattrini Li"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+from array import array
+from heapq import heappush, heappop
+from itertools import count
+
+from Maze import JUMP_DIRECTIONS
+from SearchSolution import SearchSolution
+from graph_search import backchain, INFINITY
+
+# the directions (indices into JUMP_DIRECTIONS) to search from a cell, given the direction the search
+# arrived from: moving east or west, the path may go on or turn north or south, but not turn back;
+# moving north or south, likewise. The start cell is searched in every direction.
+_NEXT_DIRECTIONS = {
+    None: (0, 1, 2, 3),
+    0: (0, 1, 3),
+    1: (1, 0, 2),
+    2: (2, 1, 3),
+    3: (3, 0, 2),
+}
+
+
+def _jump(maze, tables, x, y, direction, goal):
+    """Move from (x, y) in a direction, and return the first jump point or goal cell on the way, with its distance.
+        :return: an (x, y, distance) tuple, or None if the robot hits a wall first.
+    """
+    jump = tables[direction][maze.index(x, y)]
+    if jump == 0:
+        return None
+    dx, dy = JUMP_DIRECTIONS[direction]
+    reach = abs(jump)
+    goal_x, goal_y = goal
+
+    # moving east or west, stop on the goal if it lies on the run.
+    if dx:
+        steps = (goal_x - x) * dx
+        if goal_y == y and 0 < steps <= reach:
+            return goal_x, goal_y, steps
+
+    # moving north or south, stop on the goal's row if the goal lies on the run, or is in plain sight
+    # east or west of it: no jump point lies between the two, or the run would have stopped on that row.
+    else:
+        steps = (goal_y - y) * dy
+        if 0 < steps <= reach:
+            if goal_x == x:
+                return goal_x, goal_y, steps
+            side = 2 if goal_x > x else 0
+            if abs(goal_x - x) <= abs(tables[side][maze.index(x, goal_y)]):
+                return x, goal_y, steps
+
+    if jump < 0:
+        return None
+    return x + dx * jump, y + dy * jump, jump
+
+
+def _fill_path(jump_points):
+    """Expand a path of jump points, each in a straight line from the one before, into a path of single steps.
+    """
+    path = [jump_points[0]]
+    for x, y in jump_points[1:]:
+        px, py = path[-1]
+        dx, dy = (x > px) - (x < px), (y > py) - (y < py)
+        while (px, py) != (x, y):
+            px, py = px + dx, py + dy
+            path.append((px, py))
+    return path
+
+
+def jump_point_search(search_problem, heuristic_fn=None):
+    """Run A* over the jump points of a single-robot MazeworldProblem.
+        Returns the same (optimal) cost as `astar_search`, with one state per step in `solution.path`;
+        `nodes_visited` counts the jump points expanded.
+        :arg search_problem: a MazeworldProblem with one robot.
+        :arg heuristic_fn [optional]: the heuristic to search with, called on problem states.
+            Defaults to the Manhattan distance to the goal.
+        :return solution: a SearchSolution instance carrying information about the search run.
+    """
+    maze = search_problem.maze
+    if len(maze.robotloc) != 2 or len(search_problem.goal_locations) != 2:
+        raise ValueError("Jump Point Search plans the path of a single robot.")
+
+    name = "manhattan_heuristic" if heuristic_fn is None else heuristic_fn.__name__
+    solution = SearchSolution(search_problem, "Jump Point Search with heuristic " + name)
+    tables = maze.jump_table()
+    goal = tuple(search_problem.goal_locations)
+
+    # the heuristic, on (x, y) cells.
+    if heuristic_fn is None:
+        def estimate(x, y):
+            return abs(goal[0] - x) + abs(goal[1] - y)
+    elif search_problem.packed:
+        def estimate(x, y):
+            return heuristic_fn(maze.pack((x, y)))
+    else:
+        def estimate(x, y):
+            return heuristic_fn((x, y))
+
+    # the search tree is stored in parallel lists, as in the generic graph search, with the direction
+    # every node was reached in. Queue entries are (f, -g, -count, node), ties going to deeper, then newer nodes.
+    start = tuple(maze.robotloc)
+    node_cells = [start]
+    node_costs = [0]
+    node_parents = array("i", [-1])
+    node_directions = [None]
+    best_cost = {start: 0}
+    counter = count()
+    queue = [(estimate(*start), 0, 0, 0)]
+
+    while queue:
+        solution.max_frontier = max(solution.max_frontier, len(queue))
+
+        # get the next node, skipping it if it has been superseded by a cheaper one.
+        _, _, _, node = heappop(queue)
+        cell = node_cells[node]
+        current_cost = node_costs[node]
+        if best_cost[cell] < current_cost:
+            continue
+        solution.nodes_visited = solution.nodes_visited + 1
+
+        # if the robot is on its goal, rebuild the path step by step.
+        if cell == goal:
+            path = _fill_path(backchain(node, node_cells, node_parents))
+            solution.path = [maze.pack(step) for step in path] if search_problem.packed else path
+            solution.cost = current_cost
+            break
+
+        # jump in every direction the path may take from here, and queue the jump points reached.
+        for direction in _NEXT_DIRECTIONS[node_directions[node]]:
+            jump = _jump(maze, tables, cell[0], cell[1], direction, goal)
+            if jump is None:
+                continue
+            x, y, distance = jump
+            next_cost = current_cost + distance
+            if best_cost.get((x, y), INFINITY) <= next_cost:
+                continue
+            best_cost[(x, y)] = next_cost
+            node_cells.append((x, y))
+            node_costs.append(next_cost)
+            node_parents.append(node)
+            node_directions.append(direction)
+            heappush(queue, (next_cost + estimate(x, y), -next_cost, -next(counter), len(node_cells) - 1))
+            solution.nodes_generated = solution.nodes_generated + 1
+
+    return solution
@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""This module implements two informed searches that run in bounded memory,
+    for problems whose closed set would not fit in memory with A*:
+        IDA*: iterative deepening on f = g + h. Each iteration is a depth-first search that cuts off
+            every node whose f-value exceeds a threshold, raised to the least f-value cut off
+            in the iteration before. Memory grows with the length of the path, plus a small
+            transposition cache that skips states already reached at no greater cost in an iteration.
+        SMA*: simplified memory-bounded A*. It runs like A* until it holds a set number of nodes, then
+            makes room by forgetting the leaf with the highest f-value, remembering that value in its parent.
+    Both return optimal solutions when the heuristic is admissible (for SMA*, when the
+    solution path fits in its budget), and work on any problem A* works on.
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai", "Alberto Quattrini Li"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+from collections import OrderedDict
+from heapq import heappush, heappop
+from itertools import count
+
+from SearchSolution import SearchSolution
+from graph_search import INFINITY
+
+
+def _sorted_successors(search_problem, heuristic_fn, step_cost, state, cost):
+    """List the successors of a state as (f, cost, state) tuples, lowest f-value first,
+        and the last generated first on ties, as A* does with its default tie-breaking.
+    """
+    successors = []
+    for next_state in reversed(search_problem.get_successors(state)):
+        next_cost = cost + (1 if step_cost is None else step_cost(state, next_state))
+        successors.append((next_cost + heuristic_fn(next_state), -next_cost, next_state))
+    successors.sort(key=lambda successor: successor[:2])
+    return [(value, -negative_cost, next_state) for value, negative_cost, next_state in successors]
+
+
+def ida_star_search(search_problem, heuristic_fn, cache_size=100_000):
+    """Run IDA* -- Iterative Deepening A* on the search problem with the specified heuristic function.
+        :arg cache_size [optional]: the most states to remember, per iteration, with the least cost they
+            were reached at. States reached again at no lower cost are skipped. Once the cache is full,
+            the oldest state in it is forgotten for every new one. Defaults to 100,000.
+        :return solution: a SearchSolution instance carrying information about the search run.
+            `nodes_visited` counts the states visited by every iteration,
+            and `max_frontier` is the length of the longest path searched.
+    """
+
+    solution = SearchSolution(search_problem, "IDA* with heuristic " + heuristic_fn.__name__)
+    threshold = heuristic_fn(search_problem.start_state)
+
+    # search with increasing thresholds, until a goal is found or no node was cut off.
+    while threshold < INFINITY:
+        threshold = _cost_limited_search(search_problem, heuristic_fn, threshold, cache_size, solution)
+        if solution.path:
+            break
+
+    return solution
+
+
+def _cost_limited_search(search_problem, heuristic_fn, threshold, cache_size, solution):
+    """Run one iteration of IDA*: a depth-first search from the start state that cuts off
+        every node with an f-value above `threshold`, recording progress in `solution`.
+        Used internally by `ida_star_search`.
+        :return next_threshold: the least f-value that was cut off, or INFINITY if none was.
+    """
+    step_cost = getattr(search_problem, "step_cost", None)
+    start_state = search_problem.start_state
+    next_threshold = INFINITY
+
+    solution.nodes_visited = solution.nodes_visited + 1
+    if search_problem.is_goal(start_state):
+        solution.path = [start_state]
+        return next_threshold
+
+    # the path doubles as the DFS stack of states, and `successors` holds the remaining successors
+    # of every state on the path. `on_path` makes cycle checks O(1), and `cache` maps the latest states
+    # seen in this iteration to the least cost they were reached at.
+    path = [start_state]
+    on_path = {start_state}
+    successors = [iter(_sorted_successors(search_problem, heuristic_fn, step_cost, start_state, 0))]
+    cache = OrderedDict({start_state: 0})
+
+    while successors:
+
+        # get the next successor of the deepest state on the path. If there is none, backtrack.
+        successor = next(successors[-1], None)
+        if successor is None:
+            successors.pop()
+            on_path.discard(path.pop())
+            continue
+
+        # cut off nodes above the threshold, remembering the least f-value cut off.
+        # Successors are sorted by f-value, so the remaining ones are cut off too.
+        next_value, next_cost, next_state = successor
+        if next_value > threshold:
+            next_threshold = min(next_threshold, next_value)
+            successors[-1] = iter(())
+            continue
+
+        # skip cycles, and states already reached at no greater cost in this iteration.
+        if next_state in on_path or cache.get(next_state, INFINITY) <= next_cost:
+            continue
+        if next_state not in cache and len(cache) >= cache_size:
+            cache.popitem(last=False)
+        cache[next_state] = next_cost
+
+        # visit the state.
+        path.append(next_state)
+        on_path.add(next_state)
+        solution.nodes_visited = solution.nodes_visited + 1
+        solution.max_frontier = max(solution.max_frontier, len(path))
+
+        # if it is the goal, the path is the solution.
+        if search_problem.is_goal(next_state):
+            solution.path = path
+            solution.cost = next_cost
+            return next_threshold
+
+        successors.append(iter(_sorted_successors(search_problem, heuristic_fn, step_cost, next_state, next_cost)))
+        solution.nodes_generated = solution.nodes_generated + 1
+
+    return next_threshold
+
+
+class SMANode:
+    """
+        A node of the SMA* search tree.
+        Besides the usual state, parent and cost, each node keeps its f-value (backed up from its children
+        once they have all been generated), its successors, the children currently in memory, and the
+        f-values of the children it has forgotten, to restore them if they are generated again.
+    """
+    __slots__ = ("state", "parent", "cost", "depth", "value", "successors", "next_successor",
+                 "complete", "children", "forgotten", "in_queue", "version")
+
+    def __init__(self, state, parent, cost, value):
+        self.state = state
+        self.parent = parent
+        self.cost = cost
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.value = value
+
+        # (f, cost, state) successors, found on the first expansion; the index of the next one to
+        # generate, and whether every successor has been generated at least once.
+        self.successors = None
+        self.next_successor = 0
+        self.complete = False
+
+        self.children = {}
+        self.forgotten = {}
+
+        # whether the node is in the queue, and a counter that invalidates its older queue entries.
+        self.in_queue = False
+        self.version = 0
+
+
+def sma_star_search(search_problem, heuristic_fn, max_nodes=10_000):
+    """Run SMA* -- Simplified Memory-bounded A* on the search problem with the specified heuristic function.
+
+        The queue holds the nodes with successors that are not in memory. Every step takes the node
+        with the least f-value (the deepest, on ties) and generates one of those successors.
+        Once a node has generated all its successors, its f-value is backed up to the least f-value
+        among them, up through its ancestors. When the tree holds more than `max_nodes` nodes,
+        the leaf with the highest f-value (the shallowest, on ties) is forgotten, and its parent
+        goes back into the queue to regenerate it, if the search ever needs it again.
+        A path can hold at most `max_nodes` nodes, so deeper nodes that are not goals are never expanded.
+        :arg max_nodes [optional]: the most nodes to hold in memory. Defaults to 10,000.
+        :return solution: a SearchSolution instance carrying information about the search run.
+            `max_frontier` is the most nodes held at once, and `nodes_pruned` counts forgotten nodes.
+    """
+
+    solution = SearchSolution(search_problem, "SMA* with heuristic " + heuristic_fn.__name__)
+    step_cost = getattr(search_problem, "step_cost", None)
+
+    # the queue is a pair of heaps over the same nodes: `best` pops the node with the least f-value,
+    # the deepest first; `worst` pops the one with the highest f-value, the shallowest first.
+    # Entries are stale, and skipped, if the node left the queue or its f-value changed since.
+    counter = count()
+    best, worst = [], []
+
+    def enqueue(node):
+        node.in_queue = True
+        node.version = node.version + 1
+        tiebreak = next(counter)
+        heappush(best, (node.value, -node.depth, -tiebreak, node.version, node))
+        heappush(worst, (-node.value, node.depth, -tiebreak, node.version, node))
+
+    def dequeue(node):
+        node.in_queue = False
+        node.version = node.version + 1
+
+    def is_stale(entry):
+        return not entry[4].in_queue or entry[3] != entry[4].version
+
+    def back_up(node):
+        """Set the f-value of every complete node, from `node` up, to the least f-value of its children."""
+        while node is not None and node.complete:
+            value = min([child.value for child in node.children.values()]
+                        + list(node.forgotten.values()) + [INFINITY])
+            if value == node.value:
+                break
+            node.value = value
+            if node.in_queue:
+                enqueue(node)
+            node = node.parent
+
+    def held_cost(state):
+        node = cheapest.get(state)
+        return INFINITY if node is None else node.cost
+
+    def forget_worst_leaf():
+        """Forget the leaf with the highest f-value, except the root, and queue its parent again.
+            Entries of nodes that are not leaves are dropped; nodes are pushed again when they become leaves.
+        """
+        while worst:
+            entry = heappop(worst)
+            node = entry[4]
+            if is_stale(entry) or node.children or node.parent is None:
+                continue
+
+            dequeue(node)
+            if cheapest.get(node.state) is node:
+                del cheapest[node.state]
+            parent = node.parent
+            del parent.children[node.state]
+            parent.forgotten[node.state] = node.value
+            solution.nodes_pruned = solution.nodes_pruned + 1
+            if not parent.in_queue:
+                enqueue(parent)
+            elif not parent.children:
+                heappush(worst, (-parent.value, parent.depth, -next(counter), parent.version, parent))
+            break
+
+    # the cheapest node in memory for every state.
+    root = SMANode(search_problem.start_state, None, 0, heuristic_fn(search_problem.start_state))
+    cheapest = {root.state: root}
+    enqueue(root)
+    num_nodes = 1
+
+    while best:
+        entry = heappop(best)
+        if is_stale(entry):
+            continue
+        node = entry[4]
+        dequeue(node)
+
+        # if even the best node cannot lead to a goal within the budget, there is no solution.
+        if node.value == INFINITY:
+            break
+
+        # if the node is a goal, backtrack and rebuild the path.
+        if search_problem.is_goal(node.state):
+            solution.cost = node.cost
+            while node is not None:
+                solution.path.append(node.state)
+                node = node.parent
+            solution.path.reverse()
+            break
+
+        # on its first expansion, find the node's successors, leaving out those already on its path,
+        # and those held in memory at no greater cost: any path through them is no better than one already in the tree.
+        if node.successors is None:
+            ancestors = set()
+            ancestor = node
+            while ancestor is not None:
+                ancestors.add(ancestor.state)
+                ancestor = ancestor.parent
+            node.successors = [successor for successor in
+                               _sorted_successors(search_problem, heuristic_fn, step_cost, node.state, node.cost)
+                               if successor[2] not in ancestors
+                               and held_cost(successor[2]) > successor[1]]
+            solution.nodes_visited = solution.nodes_visited + 1
+
+        # a node without successors is a dead end: it stays in the queue, to be forgotten first.
+        if not node.successors:
+            node.complete = True
+            back_up(node)
+            enqueue(node)
+            continue
+
+        # generate the next successor that is not in memory, with an f-value no lower than its parent's,
+        # nor than the value it had when it was forgotten. Non-goal nodes that fill the budget are dead ends.
+        while node.successors[node.next_successor][2] in node.children:
+            node.next_successor = (node.next_successor + 1) % len(node.successors)
+        next_value, next_cost, next_state = node.successors[node.next_successor]
+        next_value = max(next_value, node.value, node.forgotten.pop(next_state, 0))
+        if node.depth + 2 >= max_nodes and not search_problem.is_goal(next_state):
+            next_value = INFINITY
+        child = SMANode(next_state, node, next_cost, next_value)
+        node.children[next_state] = child
+        if held_cost(next_state) > next_cost:
+            cheapest[next_state] = child
+        num_nodes = num_nodes + 1
+        solution.nodes_generated = solution.nodes_generated + 1
+
+        node.next_successor = node.next_successor + 1
+        if node.next_successor == len(node.successors):
+            node.next_successor = 0
+            node.complete = True
+
+        # put the node back in the queue if some of its successors are still not in memory,
+        # and back up its f-value if it has generated all of them.
+        if len(node.children) < len(node.successors):
+            enqueue(node)
+        back_up(node)
+
+        # make room for the child, then queue it.
+        if num_nodes > max_nodes:
+            forget_worst_leaf()
+            num_nodes = num_nodes - 1
+        enqueue(child)
+        solution.max_frontier = max(solution.max_frontier, num_nodes)
+
+    return solution
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""This module implements multi-robot path planning for Mazeworld problems
+    that plans every robot on its own, in space and time, instead of searching the joint state space.
+    It implements two planners:
+        Prioritized planning: robots are planned one after the other, each around the
+            space-time reservations of the robots planned before it. Fast, but not optimal nor complete.
+        Conflict-based search (CBS): robots are planned independently, and every conflict between
+            two paths is resolved by branching on which of the two robots gives way.
+            It returns solutions with the least sum of robot costs.
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai", "Alberto Quattrini Li"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+from heapq import heappush, heappop
+from itertools import count
+from random import Random
+
+from Maze import UNREACHABLE
+from SearchSolution import SearchSolution
+from ReservationTable import ReservationTable
+from SpaceTimeProblem import SpaceTimeProblem
+from astar_search import astar_search
+
+# Unlike MazeworldProblem, where a single robot moves at every step, here all robots move at once:
+# at every time step, each robot waits or moves to an adjacent floor cell. Two robots may not be in
+# the same cell at the same time, nor swap cells along the same edge; a robot may follow right behind
+# another. A robot's cost is the time at which it reaches its goal for the last time, and the cost of
+# a solution is the sum of the robots' costs. Solution paths are MazeworldProblem states, one per time step.
+
+
+def _robots(search_problem):
+    """Return the (x, y) start and goal locations of every robot in a MazeworldProblem.
+    """
+    state, goals = search_problem.start_state, search_problem.goal_locations
+    starts = [(state[i], state[i + 1]) for i in range(0, len(state), 2)]
+    goals = [(goals[i], goals[i + 1]) for i in range(0, len(goals), 2)]
+    return starts, goals
+
+
+def _plan_robot(maze, start, goal, reservations, solution, avoid=None):
+    """Plan the path of one robot around a reservation table with space-time A*,
+        breaking as few of the soft reservations in `avoid` as possible.
+        :return path: the (x, y) location of the robot at every time step, or None if there is no path.
+    """
+
+    # a goal that cannot be reached even in an empty maze needs no search.
+    if maze.distance_map(goal[0], goal[1])[maze.index(start[0], start[1])] == UNREACHABLE:
+        return None
+
+    problem = SpaceTimeProblem(maze, start, goal, reservations, avoid)
+    robot_solution = astar_search(problem, problem.true_distance_heuristic)
+    solution.nodes_visited = solution.nodes_visited + robot_solution.nodes_visited
+    solution.nodes_generated = solution.nodes_generated + robot_solution.nodes_generated
+    solution.max_frontier = max(solution.max_frontier, robot_solution.max_frontier)
+
+    if not robot_solution.path:
+        return None
+    return problem.location_path(robot_solution.path)
+
+
+def _joint_path(paths):
+    """Merge the paths of every robot into a path of MazeworldProblem states.
+        Robots that arrive early wait on their goals.
+    """
+    length = max(len(path) for path in paths)
+    return [tuple(coordinate for path in paths for coordinate in path[min(t, len(path) - 1)])
+            for t in range(length)]
+
+
+def _finish(solution, paths):
+    solution.path = _joint_path(paths)
+    solution.cost = sum(len(path) - 1 for path in paths)
+    return solution
+
+
+def prioritized_search(search_problem, order=None, max_restarts=None):
+    """Run prioritized planning on a MazeworldProblem.
+        Robots are planned one at a time with space-time A* (see [./SpaceTimeProblem.py]), each one
+        avoiding the cells and moves reserved by the robots planned before it. If a robot cannot be
+        planned, it is moved to the front of the order and planning restarts;
+        if that gives an order that has already failed, the order is shuffled instead.
+        :arg search_problem: a MazeworldProblem instance.
+        :arg order [optional]: the indices of the robots, highest priority first.
+            Defaults to the robots farthest from their goals first.
+        :arg max_restarts [optional]: how many times to restart with a new order. Defaults to the number of robots.
+        :return solution: a SearchSolution instance carrying information about the search run.
+            `nodes_visited` counts the states visited by every single-robot search.
+    """
+
+    solution = SearchSolution(search_problem, "Prioritized planning")
+    maze = search_problem.maze
+    starts, goals = _robots(search_problem)
+
+    if order is None:
+        order = sorted(range(len(starts)), reverse=True,
+                       key=lambda robot: maze.distance_map(*goals[robot])[maze.index(*starts[robot])])
+    order = list(order)
+    if max_restarts is None:
+        max_restarts = len(starts)
+    tried_orders = set()
+    random = Random(0)
+
+    for attempt in range(max_restarts + 1):
+
+        # plan the robots in order, reserving each robot's path for the ones after it.
+        reservations = ReservationTable()
+        paths = [None] * len(starts)
+        for robot in order:
+            path = _plan_robot(maze, starts[robot], goals[robot], reservations, solution)
+            if path is None:
+                break
+            reservations.reserve_path(path)
+            paths[robot] = path
+
+        # if every robot has a path, the solution is complete.
+        else:
+            return _finish(solution, paths)
+
+        # otherwise, give the robot that could not be planned the highest priority and try again.
+        tried_orders.add(tuple(order))
+        order.remove(robot)
+        order.insert(0, robot)
+        if tuple(order) in tried_orders:
+            random.shuffle(order)
+
+    # if no order worked, return the solution with an empty path.
+    return solution
+
+
+def _other_paths(paths, robot):
+    """Return a ReservationTable with the paths of every robot but one.
+    """
+    table = ReservationTable()
+    for other, path in enumerate(paths):
+        if other != robot:
+            table.reserve_path(path)
+    return table
+
+
+def _conflicts(paths):
+    """List the conflicts between robot paths, earliest first.
+        :return conflicts: a list of (t, robot_a, robot_b, constraint_a, constraint_b) tuples,
+            where the constraints are (method name, arguments) of the ReservationTable entry that stops
+            the corresponding robot from taking part in the conflict.
+    """
+    conflicts = []
+    length = max(len(path) for path in paths)
+    for t in range(length):
+        cells = {}
+        moves = {}
+        for robot, path in enumerate(paths):
+            cell = path[min(t, len(path) - 1)]
+
+            # vertex conflict: two robots in the same cell at the same time.
+            if cell in cells:
+                constraint = ("reserve_cell", (cell[0], cell[1], t))
+                conflicts.append((t, cells[cell], robot, constraint, constraint))
+            else:
+                cells[cell] = robot
+
+            # edge conflict: two robots swapping cells between t - 1 and t. A robot is kept off
+            # its own move by reserving the opposite move, as if someone else was making it.
+            if 0 < t < len(path):
+                previous = path[t - 1]
+                if previous != cell:
+                    other = moves.get((cell, previous))
+                    if other is not None:
+                        conflicts.append((t, other, robot,
+                                          ("reserve_move", (previous[0], previous[1], cell[0], cell[1], t - 1)),
+                                          ("reserve_move", (cell[0], cell[1], previous[0], previous[1], t - 1))))
+                    moves[(previous, cell)] = robot
+    return conflicts
+
+
+def cbs_search(search_problem, max_nodes=10000):
+    """Run conflict-based search (CBS) on a MazeworldProblem.
+        Every node of the constraint tree holds one ReservationTable of constraints per robot and
+        the cheapest path of every robot under its constraints. The cheapest node is expanded by
+        finding its first conflict between two robots, and branching into two children where
+        one or the other robot is constrained not to take part in it, re-planning only that robot.
+        Among its cheapest paths, a re-planned robot takes the one with the fewest conflicts with the
+        other robots' paths, which keeps the tree from branching on conflicts that need not happen.
+        :arg search_problem: a MazeworldProblem instance.
+        :arg max_nodes [optional]: the most constraint tree nodes to expand before giving up. Defaults to 10000.
+        :return solution: a SearchSolution instance carrying information about the search run.
+            `nodes_visited` counts the states visited by every single-robot search.
+    """
+
+    solution = SearchSolution(search_problem, "Conflict-based search")
+    maze = search_problem.maze
+    starts, goals = _robots(search_problem)
+
+    # the root node plans every robot without constraints.
+    constraints = [ReservationTable() for _ in starts]
+    paths = []
+    for robot in range(len(starts)):
+        path = _plan_robot(maze, starts[robot], goals[robot], constraints[robot], solution)
+        if path is None:
+            return solution
+        paths.append(path)
+
+    # the constraint tree is searched cheapest first, ties going to the most recent node.
+    counter = count()
+    queue = [(sum(len(path) for path in paths), 0, constraints, paths)]
+
+    for expanded in range(max_nodes):
+        if not queue:
+            break
+        cost, _, constraints, paths = heappop(queue)
+
+        # if no two paths conflict, they are the solution.
+        conflicts = _conflicts(paths)
+        if not conflicts:
+            return _finish(solution, paths)
+
+        # otherwise, branch on which of the two robots in the first conflict is kept out of it.
+        t, robot_a, robot_b, constraint_a, constraint_b = conflicts[0]
+        children = []
+        for robot, (method, arguments) in ((robot_a, constraint_a), (robot_b, constraint_b)):
+            table = constraints[robot].copy()
+            getattr(table, method)(*arguments)
+
+            path = _plan_robot(maze, starts[robot], goals[robot], table, solution, _other_paths(paths, robot))
+            if path is None:
+                continue
+
+            child_paths = list(paths)
+            child_paths[robot] = path
+
+            # bypass: if the new path costs the same and leaves fewer conflicts,
+            # it is just as good a path under the node's own constraints; take it instead of branching.
+            if len(path) == len(paths[robot]) and len(_conflicts(child_paths)) < len(conflicts):
+                children = [(cost, constraints, child_paths)]
+                break
+
+            child_constraints = list(constraints)
+            child_constraints[robot] = table
+            children.append((cost - len(paths[robot]) + len(path), child_constraints, child_paths))
+
+        for child_cost, child_constraints, child_paths in children:
+            heappush(queue, (child_cost, -next(counter), child_constraints, child_paths))
+
+    # if the tree has been exhausted or the budget spent, return the solution with an empty path.
+    return solution
@@ -13,18 +13,45 @@ __github__ = "@siavava"
 
 
 from MazeworldProblem import MazeworldProblem
-from Maze import Maze
-from astar_search import astar_search
+from Maze import Maze, UNREACHABLE
+from astar_search import astar_search, partial_expansion_astar_search, weighted_astar_search, ara_star_search, focal_search
+from multi_agent_search import prioritized_search, cbs_search
+from memory_bounded_search import ida_star_search, sma_star_search
+from jump_point_search import jump_point_search
+from random import Random
 
 # null heuristic, useful for testing astar search without heuristic (uniform cost search).
 def null_heuristic(state):
     return 0
 
-def test(map_file, final_state, animate=True):
+def test(map_file, final_state, animate=True, true_distances=False, partial_expansion=False,
+         packed=False, search_fn=None, **search_args):
     test_maze = Maze(map_file)
-    test_mp = MazeworldProblem(test_maze, final_state)
-    solution = astar_search(test_mp, test_mp.manhattan_heuristic)
-    if solution.path:
+    test_mp = MazeworldProblem(test_maze, final_state, true_distances=true_distances, packed=packed)
+    heuristic = test_mp.true_distance_heuristic if true_distances else test_mp.manhattan_heuristic
+    if search_fn is None:
+        search_fn = partial_expansion_astar_search if partial_expansion else astar_search
+    solution = search_fn(test_mp, heuristic, **search_args)
+    solution.path = test_mp.unpack_path(solution.path)
+    if solution.path and animate:
+        test_mp.animate_path(solution.path)
+    print(solution)
+
+def test_multi_agent(map_file, num_robots, seed=0, conflict_based=False, animate=False):
+    """
+        Place `num_robots` robots and goals on random floor cells of a map
+        (all reachable from one another), and plan all the robots at once.
+    """
+    test_maze = Maze(map_file)
+    floor = [(x, y) for y in range(test_maze.height) for x in range(test_maze.width) if test_maze.is_floor(x, y)]
+    distances = test_maze.distance_map(*floor[0])
+    floor = [(x, y) for x, y in floor if distances[test_maze.index(x, y)] != UNREACHABLE]
+    cells = Random(seed).sample(floor, 2 * num_robots)
+
+    test_maze.robotloc = [coordinate for cell in cells[:num_robots] for coordinate in cell]
+    test_mp = MazeworldProblem(test_maze, tuple(coordinate for cell in cells[num_robots:] for coordinate in cell))
+    solution = cbs_search(test_mp) if conflict_based else prioritized_search(test_mp)
+    if solution.path and animate:
         test_mp.animate_path(solution.path)
     print(solution)
 
@@ -45,6 +72,7 @@ def main():
     m9, final9 = "mazes/maze9.maz", (13, 13, 1, 13, 13, 1, 1, 1)
     m10, final10 = "mazes/maze10.maz", (2, 1, 3, 1, 1, 2, 2, 2, 3, 2, 1, 3, 2, 3, 3, 3)
     m11, final11 = "mazes/hole.maz", (16, 3, 5, 5)
+    m12, final12 = "mazes/corridors.maz", (1, 1)
     
     
     ####################################################
@@ -68,6 +96,9 @@ def main():
     # # Test on Maze 6
     # test(m6, final6)
     
+    # # Test on Maze 6, with states packed into integers.
+    # test(m6, final6, packed=True)
+    
     # # Test on Maze 7
     # test(m7, final7)
     
@@ -77,6 +108,28 @@ def main():
     # Test on Maze9
     # test(m9, final9)
     
+    # Test on Maze9, with the wall-aware true-distance heuristic.
+    # test(m9, final9, true_distances=True)
+    
+    # Test on Maze10, eight robots in a 3x3 room, with partial expansion A*.
+    # test(m10, final10, animate=False, partial_expansion=True)
+    
+    # Test on Maze6 with partial expansion A*: the same path as A*, with far fewer nodes stored.
+    # test(m6, final6, animate=False, partial_expansion=True)
+    
+    # Test on Maze6, trading optimality for speed: weighted A*, ARA* with a time budget, and focal search.
+    # test(m6, final6, search_fn=weighted_astar_search, weight=2)
+    # test(m6, final6, search_fn=ara_star_search, time_limit=0.1)
+    # test(m6, final6, search_fn=focal_search, weight=2)
+    
+    # Test on Maze10 in bounded memory: IDA* with a small transposition cache, and SMA* holding at most 500 nodes.
+    # test(m10, final10, search_fn=ida_star_search, cache_size=1000)
+    # test(m10, final10, search_fn=sma_star_search, max_nodes=500)
+    
+    # Test a single robot along long corridors, expanding jump points only.
+    # test(m12, final12, animate=False)
+    # test(m12, final12, animate=False, search_fn=jump_point_search)
+    
     #######################################################
     ### These additional tests are on Maps we developed ###
     ### in my Spring CS50 class. ##########################
@@ -92,6 +145,12 @@ def main():
     # NOTE: Couldn't get this to work probably because of how the map is :(
     # test(m11, final11)
     
+    # test 20 robots at once, planned one after the other around each other's paths.
+    # test_multi_agent("mazes/more_mazes/remapped/big.maz", 20)
+    
+    # test a few robots at once, with optimal conflict-based search.
+    # test_multi_agent("mazes/more_mazes/remapped/13akersdozen-spider.maz", 4, conflict_based=True)
+    
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -14,15 +14,19 @@ __github__ = "@siavava"
 
 from SensorlessProblem import SensorlessProblem
 from Maze import Maze
+from astar_search import astar_search, weighted_astar_search, ara_star_search, focal_search
+from memory_bounded_search import ida_star_search, sma_star_search
 
 # null heuristic, useful for testing astar search without heuristic (uniform cost search).
 def null_heuristic(state):
     return 0
 
-def test(map_file, animate=True):
+def test(map_file, animate=True, packed=False, prune_dominated=True, true_distances=False,
+         search_fn=astar_search, **search_args):
     test_maze = Maze(map_file)
-    test_prob = SensorlessProblem(test_maze)
-    solution = test_prob.locate()
+    test_prob = SensorlessProblem(test_maze, packed=packed, prune_dominated=prune_dominated)
+    heuristic = test_prob.true_distance_heuristic if true_distances else test_prob.manhattan_heuristic
+    solution = test_prob.locate(heuristic, search_fn=search_fn, **search_args)
     if solution.path and animate:
         test_prob.animate_path(solution.path)
         
@@ -38,6 +42,8 @@ def main():
     """
     # Test problems
     
+    # Note: maze 1 has no robots, so there is no belief to localize.
+    m1 = "mazes/maze1.maz"
     m3 = "mazes/maze3.maz"
     m4 = "mazes/maze4.maz"
     
@@ -58,6 +64,10 @@ def main():
     ### will turn off playing path animations.       ###
     ####################################################
     
+    # Test on Maze 1, with no robots: no path, packed or not.
+    # test(m1, animate=False)
+    # test(m1, animate=False, packed=True)
+    
     # Test on Maze 3
     # test(m3, animate=True)
     
@@ -70,6 +80,9 @@ def main():
     # # Test on Maze 6
     # test(m6, animate=False)
     
+    # # Test on Maze 6, with states packed into integers.
+    # test(m6, animate=False, packed=True)
+    
     # # Test on Maze 7
     # test(m7, animate=False)
     
@@ -79,6 +92,21 @@ def main():
     # # Test on Maze9
     # test(m9, animate=False)
     
+    # # Test on Maze9, with the all-pairs true-distance heuristic (builds the maze's distance table first).
+    # test(m9, animate=False, true_distances=True)
+    
+    # # Test on Maze9, without skipping states dominated by smaller sets of possible locations.
+    # test(m9, animate=False, prune_dominated=False)
+    
+    # # Test on Maze9, trading optimality for speed: weighted A*, ARA* with a time budget, and focal search.
+    # test(m9, animate=False, packed=True, search_fn=weighted_astar_search, weight=2)
+    # test(m9, animate=False, packed=True, search_fn=ara_star_search, time_limit=0.5)
+    # test(m9, animate=False, packed=True, search_fn=focal_search, weight=2)
+    
+    # # Test on Maze4 in bounded memory, with IDA* and with SMA* holding at most 200 nodes.
+    # test(m4, animate=False, packed=True, search_fn=ida_star_search)
+    # test(m4, animate=False, packed=True, search_fn=sma_star_search, max_nodes=200)
+    
     #######################################################
     ### These additional tests are on Maps we developed ###
     ### in my Spring CS50 class. ##########################
@@ -9,13 +9,11 @@ __credits__ = ["Amittai"]
 __email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
 __github__ = "@siavava"
 
-from numpy import inf                                       # infinity
 from chess import Board                                     # Chess board
-from erratum import (log_error, log_info, log_debug_info)   # logging functions. see [../erratum.py] for more info.
+from erratum import (log_info, log_debug_info)              # logging functions. see [../erratum.py] for more info.
 from EnhancedAlphaBetaAI import EnhancedAlphaBetaAI         # A/B AI for searching.
-from EnhancedAlphaBetaAI import OrderedMove
+from TimeManager import TimeManager                         # Time management. see [./TimeManager.py] for more info.
 
-from PriorityQueue import PriorityQueue                    # Priority queue for move reordering.
 class BetterAI():
     """
         A Chess AI that uses Alpha-Beta pruning with the Minimax algorithm to search for the best move.
@@ -25,29 +23,35 @@ class BetterAI():
         in a game with less branching than Chess.
         
         Rather than blindly follow all moves in searching,
-        `BetterAI` will first check the state of the board 
-        immediately after the moves to determine the moves likely to be best,
-        and only follow the top *move_count* moves 
-        where X is a value specified in the constructor, defaulted to 7.
+        `BetterAI` orders the moves at the root with the engine's move ordering
+        (the principal variation and transposition table move first, then captures, killers and history),
+        and only follows the first *move_count* of them,
+        where *move_count* is a value specified in the constructor, defaulted to 4.
         
         This module behavs in the same way as Iterative Deepening, but uses the EnhancedAlphaBetaAI module as a search engine.
+        Each move is chosen within a time limit: deeper searches are started until half of it has passed,
+        and the search in progress when it runs out is aborted, falling back on the deepest completed search.
+        Each depth searches the principal variation and the best moves found by the depth before first,
+        as stored in the engine's transposition table, which is kept from one move to the next.
     """
     
     
-    def __init__(self, max_depth=7, maximizing=True, move_count=4, timeout=15, debug=False):
+    def __init__(self, max_depth=7, maximizing=True, move_count=4, timeout=5, debug=False, tt_size=16):
         """
             Constructor.
             :arg max_depth: the maximum depth to search to.
             :arg maximizing: whether to maximize or minimize the utility.
             :arg move_count: the number of moves to follow.
-            :arg timeout: the *maximum* number of search operations to do.
+            :arg timeout: the time to choose a move in, in seconds (see [./TimeManager.py]).
             :arg debug: whether to print debug information.
+            :arg tt_size: the size of the search engine's transposition table, in megabytes.
         """
         self.maximizing = maximizing
         self.max_depth = max_depth
         self.debug = debug
         self.search_engine: EnhancedAlphaBetaAI = \
-            EnhancedAlphaBetaAI(0, maximizing=self.maximizing, memoized=False, move_count=move_count, debug=debug)
+            EnhancedAlphaBetaAI(0, maximizing=self.maximizing, memoized=True, move_count=move_count,
+                                debug=debug, tt_size=tt_size)
         self.prev_moves = set()
         self.move_count = move_count
         self.timeout = timeout
@@ -58,84 +62,21 @@ class BetterAI():
             Given a board state, chooses the best move to play next.
         """        
         
-        # initialize the best move and cost.
-        best_move, best_cost = None, -inf
-        counter = self.timeout
+        # start the clock, and let the engine know which moves were played before, to avoid repeating them.
+        time_manager = TimeManager(self.timeout)
+        self.search_engine.prev_moves = self.prev_moves
+        self.search_engine.memory.new_search()
         
-        # iterate over allowed depths.
-        for depth in range(1, self.max_depth):
-            
-            if best_move:
-                board.push(best_move)
-                new_cost = self.search_engine.alpha_beta_search(board, depth=depth)
-                board.pop()
-                
-                # First, recheck the best move from previous depth and update cost if it changes.
-                if new_cost != best_cost:
-                    if self.debug:
-                        log_error(f"Move {best_move} changed in score from {best_cost} to {new_cost}.")
-                    best_cost = new_cost
-                    
-            ordered_moves = self.search_engine.reorder_moves(board, board.legal_moves)
-            
-            # get every possible move and explore it to the current depth.
-            
-            move_count = self.move_count
-            while move_count > 0 and ordered_moves:
-                
-                move_count -= 1
-                move = ordered_moves.pop().move
-                
-                # try the move
-                board.push(move)
-                
-                # get the utility of the board after the move.
-                cost = self.search_engine.alpha_beta_search(board, depth=depth)
-                
-                # check if the move improves the utility.
-                # NOTE: we check whether it *matches* the utility, OR if it *betters* the utility.
-                # This helps avoid a repetition loop where a sequence of first-occurring moves loop back
-                # to each other and the game gets stuck in a loop. 
-                # However, we also need to avoid blindly chosing the last move played -- 
-                # so we check if the state of the board after the move has been recorded before
-                # in the prev_moves set.
-                
-                if ( (self.maximizing) and (cost >= best_cost) ) \
-                    or ( (not self.maximizing) and (cost <= best_cost) ):
-                        
-                    # if the cost strictly improves the utility, remember it and log progress.
-                    if cost != best_cost:
-                        
-                        # if debug enabled, print progress
-                        if self.debug:
-                            if not (best_cost == -inf or best_cost == inf):
-                                log_debug_info(f"Depth {depth}; better move found, score shift from {best_cost} to {cost}.")
-                            else:
-                                log_debug_info(f"First move found at depth {depth}; score = {cost}.")
-                        
-                        best_move, best_cost = move, cost
-                        
-                    elif not ((cost == best_cost) and (str(move) in self.prev_moves)):
-                        best_move, best_cost = move, cost
-                        
-                
-                # undo the move
-                board.pop()
-                
-                # if the timeout is reached, stop searching other moves. Otherwise, decrement the timeout.
-                if counter <= 0: break
-                else: counter -= 1
-                
-            
-            # if debug is enabled, print progress
-            if self.debug:
-                log_debug_info(f"Depth {depth}, best move: {best_move}, cost: {best_cost}.")
-                
-            if counter <= 0: break
-         
+        # deepen iteratively until the time is up.
+        best_move, best_cost = self.search_engine.principal_variation_search(board, self.max_depth, time_manager)
+        
+        # if debug is enabled, print progress
+        if self.debug:
+            log_debug_info(f"Searched {self.search_engine.nodes} nodes (cumulative) in {time_manager.elapsed():.2f} seconds.")
+            log_debug_info(f"Transposition Table: {self.search_engine.memory}.")
         
         # once the best move is found, remember it and return it.
-        self.prev_moves.add(str(move))
+        self.prev_moves.add(str(best_move))
         
         # print information on chosen best move.
         log_info(f"Better AI recommends move {best_move} with cost {best_cost}")
@@ -18,62 +18,15 @@ import chess                                                # Chess module
 from random import shuffle                                  # function to shuffle moves.
 
 from erratum import (log_error, log_info, log_debug_info)   # logging functions. see [./erratum.py] for more info.
-from TranspositionTable import TranspositionTable           # Transposition table.  see [./TranspositionTable.py] for more info.
-from PriorityQueue import PriorityQueue                     # Priority queue. see [./priorityqueue.py] for more info.
+from TranspositionTable import (TranspositionTable, ZobristHash, zobrist_key, EXACT, LOWER, UPPER)
+                                                            # Transposition table.  see [./TranspositionTable.py] for more info.
+from TimeManager import (TimeManager, SearchTimeout, unwind)  # Time management. see [./TimeManager.py] for more info.
+from heapq import (heapify, heappop)                        # heap functions, to order quiet moves lazily.
 
+# piece values for ordering captures: most valuable victim first, then least valuable attacker.
+# The king is never captured, and is the most valuable attacker to avoid.
+PIECE_VALUES = [0, 1, 3, 3, 5, 9, 10]    # indexed by piece type: None, pawn, knight, bishop, rook, queen, king.
 
-################## Added abstraction for reordering moves ##################
-class OrderedMove():
-    """
-        This class represents a search node.
-        A search node is a state of the game, along with its value.
-    """
-    def __init__(self, caller, board: Board, move: chess.Move, max_heap=True):
-        
-        self.max_heap: bool = max_heap
-        self.move = move
-        
-        board.push(move)
-        self.value = caller.get_score(board)
-        board.pop()
-        
-    def priority(self):
-        """Return the current Node's priority value.
-            This value is the sum of the transition cost
-            to the Node and the heuristic estimating distance
-            to the goal state.
-        """
-        return self.value
-
-    # Comparators for the heapq module.
-    # These functions are used ot devise an ordering for AstarNode instances,
-    # in order to arrange them in the priority queue.
-    #
-    # NOTE: My PriorityQueue module was designed to order items using a Min-Heap.
-    # To generate a Max-Heap, I reversed the comparators.
-    def __gt__(self, other):
-        if self.max_heap:
-            return self.value < other.value
-        else:
-            return self.value > other.value
-    
-    def __lt__(self, other):
-        if self.max_heap:
-            return self.value > other.value
-        else:
-            return self.value < other.value
-    
-    def __eq__(self, other):
-        return self.value == other.value
-    
-    def __ge__(self, other):
-        return self > other or self == other
-    
-    def __le__(self, other):
-        return self < other or self == other
-    
-    def __str__(self):
-        return str(self.value)
 
  ##################### Normal A/B functions ################################
 class EnhancedAlphaBetaAI():
@@ -84,27 +37,44 @@ class EnhancedAlphaBetaAI():
         might not be able to see as far down the road as it would
         in a game with less branching than Chess. 
     """
-    def __init__(self, depth, maximizing=True, move_count=inf, debug=False, memoized=True, ids=False):
+    
+    # scores are whole numbers (material counts), so a window one point wide is a null window.
+    NULL_WINDOW = 1
+    
+    def __init__(self, depth, maximizing=True, move_count=inf, debug=False, memoized=True, tt_size=16,
+                 pvs=True, aspiration=1):
         """
             Constructor.
             :arg `depth`: maximum search depth.
             :arg `maximizing` [optional]: should be explicitly set to False
             if the goal is to minimize (not maximize) the heuristic. 
+            :arg `tt_size` [optional]: the size of the transposition table, in megabytes, if `memoized`.
+            :arg `pvs` [optional]: search with Principal Variation Search (see `principal_variation_search`).
+            If False, every root move is searched with a full window by `alpha_beta_search`.
+            :arg `aspiration` [optional]: the half-width of the aspiration windows searched by PVS.
         """
         self.depth: int = int(depth)
+        self.pvs: bool = pvs
+        self.aspiration = aspiration
+        
+        # the time manager of the search in progress, if it is timed,
+        # and the principal variation found by the last iteration of PVS, as moves and by Zobrist hash.
+        self.time_manager: TimeManager = None
+        self.pv: list = []
+        self.pv_moves: dict = {}
         
+        # the transposition table is keyed by Zobrist hash, kept up to date as the search pushes and pops moves.
+        self.zobrist: ZobristHash = ZobristHash()
         if memoized:
-            self.memory: TranspositionTable = TranspositionTable()
-            self.memory["*"] = 0 # dummy entry to avoid errors.
+            self.memory: TranspositionTable = TranspositionTable(size_mb=tt_size)
         else:
             self.memory = None
-            
-        if ids:
-            self.ids = True
-            self.ids_moves = TranspositionTable()
-        else:
-            self.ids = False
-            self.ids_moves = None
+        
+        # move ordering: the killer moves of every ply, and the history score of every (side, from, to) move.
+        # See `search_order`.
+        self.killers: list = []
+        self.history: list = [0] * (2 * 64 * 64)
+        self.root_length: int = 0
         
         self.maximizing: bool = maximizing
         self.debug: bool = debug
@@ -114,44 +84,59 @@ class EnhancedAlphaBetaAI():
         # variables to track performance
         self.pruned_branches: int = 0
         self.remembered_states: int = 0
+        self.nodes: int = 0
         
-    def get_score(self, board: Board):
+    def choose_move(self, board: Board):
         """
-            Given a board state, calculate the heuristic value of that board state.
+            Given a board state, chooses the best move to play next.
         """
         
-        if self.ids and (board in self.ids_moves):
-            return self.ids_moves[board]
-        return self.evaluate(board)
-
-    def choose_move(self, board: Board):
+        # results of earlier moves are still useful, but give way to this search's when the table is full.
+        if self.memory is not None: self.memory.new_search()
+        
+        if self.pvs:
+            best_move, best_cost = self.principal_variation_search(board)
+        else:
+            best_move, best_cost = self.full_window_search(board)
+        
+        # once the best move is found, remember it and return it.
+        self.prev_moves.add(str(best_move))
+        
+        #########! if debug flag is set, print debug info. #########
+        if self.debug:
+            if self.memory is not None: log_info(f"Transposition Table: {self.memory}.")
+            log_info(f"Pruned {self.pruned_branches} branches.")
+            if self.memory is not None: log_info(f"Re-encountered {self.remembered_states} states (cumulative)")
+            log_info(f"Searched {self.nodes} nodes (cumulative).")
+           
+        # print information on chosen best move. 
+        log_info(f"\nEnhanced A/B recommending move = {str(best_move)}, move score = {best_cost}")
+        
+        # return chosen move
+        return best_move
+    
+    def full_window_search(self, board: Board):
         """
-            Given a board state, chooses the best move to play next.
+            Given a board state, searches every move with `alpha_beta_search`, each with a full window.
+            :return: the best move, and its score.
         """
         
         # get all moves, initialize best utility to neg infinity.
         best_move = None
         best_cost = -inf if self.maximizing else inf
         
-        legal_moves: list = list(board.legal_moves)
-        reordered_moves: PriorityQueue = self.reorder_moves(board, legal_moves, max_heap=self.maximizing)
+        self.clear_move_ordering()
+        entry = self.memory.probe(zobrist_key(board)) if self.memory is not None else None
         
         num_moves = self.move_count
-        while num_moves > 0 and reordered_moves:
+        for move in list(self.search_order(board, entry.best_move if entry is not None else None)):
             
+            if num_moves <= 0: break
             num_moves -= 1
-            move = reordered_moves.pop().move
             
+            # search the move. Positions searched before are looked up in the transposition table.
             board.push(move)
-            
-            if self.memory and board in self.memory:
-                cost = self.memory[board]
-                self.remembered_states += 1
-            
-            else:
-                cost = self.alpha_beta_search(board)
-                if self.memory: self.memory[board] = cost       # memoizing search
-                if self.ids: self.ids_moves[board] = cost             # memoizing IDS reordering
+            cost = self.alpha_beta_search(board)
                 
             # check if the move improves the utility.
             # NOTE: we check whether it *matches* the utility, OR if it *betters* the utility.
@@ -182,26 +167,13 @@ class EnhancedAlphaBetaAI():
             board.pop()
             
             # if checkmate encountered, no need to keep searching.
-            if best_cost == inf:
+            if best_cost == (inf if self.maximizing else -inf):
                 break
         
-        # once the best move is found, remember it and return it.
-        self.prev_moves.add(str(best_move))
-        
-        #########! if debug flag is set, print debug info. #########
-        if self.debug:
-            if self.memory: log_info(f"Transposition Table size: {len(self.memory)}.")
-            log_info(f"Pruned {self.pruned_branches} branches.")
-            if self.memory: log_info(f"Re-encountered {self.remembered_states} states (cumulative)")
-           
-        # print information on chosen best move. 
-        log_info(f"\nEnhanced A/B recommending move = {str(best_move)}, move score = {best_cost}")
-        
-        if self.memory: self.memory[best_move] = best_cost
-        if self.ids: self.ids_moves[board] = cost             # memoizing IDS reordering
+        # remember the move chosen, for move ordering if the position comes up again.
+        self.remember(zobrist_key(board), self.depth + 1, best_cost, EXACT, best_move)
         
-        # return chosen move
-        return best_move
+        return best_move, best_cost
     
     def cutoff_test(self, board: Board, depth: int):
         """
@@ -222,85 +194,124 @@ class EnhancedAlphaBetaAI():
         
         if not depth: depth = self.depth
         
+        # hash the board from scratch; the search updates the hash as it goes.
+        self.zobrist.reset(board)
+        self.root_length = len(board.move_stack)
+        
+        # with PVS, search the board with negamax, and turn its score back to White's point of view.
+        if self.pvs:
+            value = self.negamax_value(board, depth, -inf, inf)
+            return value if board.turn == chess.WHITE else -value
+        
         # if cutoff point has been reached, return an evaluation of the board state.
         if self.cutoff_test(board, depth):
             cost = self.evaluate(board)
-            if self.memory: self.memory[board] = cost
-            if self.ids: self.ids_moves[board] = cost             # memoizing IDS reordering
+            self.remember(self.zobrist.key(board), depth, cost, EXACT)
             return cost
         
-        # otherwise, if the target is to maximize, return the max_value.
-        elif self.maximizing:
+        # otherwise, if White is to move, return the max_value.
+        elif board.turn == chess.WHITE:
             return self.max_value(board, depth, -inf, inf)
         
-        # otherwise, return the min_value.
+        # otherwise, Black is to move: return the min_value.
         else:
             return self.min_value(board, depth, -inf, inf)
-            
+    
+    def recall(self, key, depth, best, worst):
+        """
+            Look up a board state in the transposition table.
+            :return: a (value, move) pair. The value is the stored score if the state has been searched
+            at least `depth` plies deep already, and the score settles a search between `best` and `worst`;
+            otherwise None, and the state must be searched. The move is the best move stored, or None.
+        """
+        
+        entry = self.memory.probe(key) if self.memory is not None else None
+        if entry is None:
+            return None, None
+        
+        value = entry.cutoff(depth, best, worst)
+        if value is not None:
+            self.remembered_states += 1
+        return value, entry.best_move
+    
+    def remember(self, key, depth, value, bound, best_move=None):
+        """
+            Save the result of searching a board state `depth` plies deep to the transposition table.
+        """
+        
+        if self.memory is not None: self.memory.store(key, depth, value, bound, best_move)
+    
+    @staticmethod
+    def bound(value, best, worst):
+        """
+            Given the value of a search between `best` and `worst`, determine what the value is:
+            a search that failed low only proves an upper bound, one that failed high only a lower bound.
+        """
+        
+        if value <= best:
+            return UPPER
+        elif value >= worst:
+            return LOWER
+        return EXACT
     
     def max_value(self, board, depth, best, worst):
         """
             Given a board state, finds the maximum value for that state.
         """
+        
+        self.nodes += 1
 
-        # if state has been seen already, get the value from transposition table.
-        if self.memory and (board in self.memory):
-            self.remembered_states += 1
-            value = self.memory[board]
-            if self.ids: self.ids_moves[board] = value             # memoizing IDS reordering
+        # if state has been searched deep enough already, get the value from transposition table.
+        key = self.zobrist.key(board)
+        value, best_move = self.recall(key, depth, best, worst)
+        if value is not None:
             return value
             
         # otherwise, if cutoff point has been reached, evaluate the state of the board.
         if self.cutoff_test(board, depth):
             value = self.evaluate(board)
-            if self.memory: self.memory[board] = value
-            if self.ids: self.ids_moves[board] = value            # memoizing IDS reordering
+            self.remember(key, depth, value, EXACT)
             return value
         
         # otherwise, recursively find the max of min for each next state,
         # remembering the state that gives the best outcome.
+        # The best move found by an earlier search of the state, if any, is searched first.
         #
         # NOTE: If the value is greater than or equal to the worst value from the other search nodes,
         # since we know the next player will be minimizing (and we are maximizing here),
         # we can prune the remaining searches because they are insignificant.
         #
         # otherwise, we:
-        #   1. save the value to the transposition table, 
-        #   2. update the best value seen yet, 
-        #   3. and continue the looping search on other next states.
+        #   1. update the best value seen yet, 
+        #   2. and continue the looping search on other next states.
+        # Finally, we save the value to the transposition table, with the bound it proves.
         else:
             
             highest_value = -inf
-            
-            legal_moves: list = list(board.legal_moves)
-            reordered_moves: PriorityQueue = self.reorder_moves(board, legal_moves, max_heap=self.maximizing)
+            initial_best = best
             
             num_moves = self.move_count
-            while num_moves > 0 and reordered_moves:
+            for move in self.search_order(board, best_move):
                 
+                if num_moves <= 0: break
                 num_moves -= 1
-                move = reordered_moves.pop().move
                 
-                board.push(move)
+                self.zobrist.push(board, move)
+                value = self.min_value(board, depth-1, best, worst)
+                self.zobrist.pop(board)
                 
-                if self.memory and board in self.memory:
-                    highest_value = max(highest_value, self.memory[board])
-                    self.remembered_states += 1
-                
-                else:
-                    highest_value = max(highest_value, self.min_value(board, depth-1, best, worst))
-                    
-                board.pop()
+                if value > highest_value:
+                    highest_value, best_move = value, move
                 
                 if highest_value >= worst:
                     self.pruned_branches += 1
+                    self.record_cutoff(board, move, depth)
                     break
                     
                 else:
                     best = max(best, highest_value)
                     
-            if self.memory: self.memory[board] = highest_value
-            if self.ids: self.ids_moves[board] = highest_value             # memoizing IDS reordering
+            self.remember(key, depth, highest_value, self.bound(highest_value, initial_best, worst), best_move)
             return highest_value
     
     def min_value(self, board, depth, best, worst):
@@ -308,88 +319,365 @@ class EnhancedAlphaBetaAI():
             Given a board state, finds the minimum value for that state.
         """
         
-        # if state has been seen already, get the value from transposition table.
-        if self.memory and (board in self.memory):
-            self.remembered_states += 1
-            value = self.memory[board]
-            if self.ids: self.ids_moves[board] = value             # memoizing IDS reordering
+        self.nodes += 1
+        
+        # if state has been searched deep enough already, get the value from transposition table.
+        key = self.zobrist.key(board)
+        value, best_move = self.recall(key, depth, best, worst)
+        if value is not None:
             return value
         
         # otherwise, if cutoff point has been reached, evaluate the value of the board.
         elif self.cutoff_test(board, depth):
             value = self.evaluate(board)
-            if self.memory: self.memory[board] = value
-            if self.ids: self.ids_moves[board] = value             # memoizing IDS reordering
+            self.remember(key, depth, value, EXACT)
             return value
         
         # otherwise, recursively find the max of min for each next state,
         # remembering the state that gives the best outcome.
+        # The best move found by an earlier search of the state, if any, is searched first.
         #
         # NOTE: If the value is less than or equal to the best value from the other search nodes,
         # since we know the next player will be maximizing (and we are minimizing here),
         # we can prune the remaining searches because they are insignificant.
         #
         # otherwise, we:
-        #   1. save the value to the transposition table, 
-        #   2. update the worst value seen yet, 
-        #   3. and continue the looping search on other next states.
+        #   1. update the worst value seen yet, 
+        #   2. and continue the looping search on other next states.
+        # Finally, we save the value to the transposition table, with the bound it proves.
         else: 
             
             lowest_value = inf
-            
-            legal_moves: list = list(board.legal_moves)
-            reordered_moves: PriorityQueue = self.reorder_moves(board, legal_moves, max_heap=self.maximizing)
+            initial_worst = worst
             
             num_moves = self.move_count
             
             # get the best move until the specified number of moves to be considered is reached or moves end.
-            while num_moves > 0 and reordered_moves:
+            for move in self.search_order(board, best_move):
                 
+                if num_moves <= 0: break
                 num_moves -= 1
-                move = reordered_moves.pop().move
-                
-                board.push(move)
                 
-                if self.memory and board in self.memory:
-                    lowest_value = min(lowest_value, self.memory[board])
-                    self.remembered_states += 1
+                self.zobrist.push(board, move)
+                value = self.max_value(board, depth-1, best, worst)
+                self.zobrist.pop(board)
                 
-                else:
-                    lowest_value = min(lowest_value, self.max_value(board, depth-1, best, worst))
-                    
-                board.pop()
+                if value < lowest_value:
+                    lowest_value, best_move = value, move
                 
                 if lowest_value <= best:
                     self.pruned_branches += 1
+                    self.record_cutoff(board, move, depth)
                     break
                     
                 else:
                     worst = min(worst, lowest_value)
                     
-            if self.memory: self.memory[board] = lowest_value
-            if self.ids: self.ids_moves[board] = lowest_value             # memoizing IDS reordering
+            self.remember(key, depth, lowest_value, self.bound(lowest_value, best, initial_worst), best_move)
             return lowest_value
+
+    ###############################################################################
+    ##################### Principal Variation Search (PVS) ########################
+    ###############################################################################
+    def principal_variation_search(self, board: Board, max_depth=None, time_manager: TimeManager = None):
+        """
+            Given a board state, finds the best move with Principal Variation Search,
+            deepening iteratively up to `max_depth` plies, by default the search depth
+            plus the root move, as `full_window_search` does.
+            
+            PVS searches with negamax: scores are from the point of view of the player to move,
+            so every node maximizes, and a child's score is the negation of its own.
+            It assumes the first move searched at each node (the best move stored in the transposition table,
+            or the best-ordered one) is the best: the other moves are searched with a null window,
+            which only proves that they are no better. A move that turns out to be better is searched again
+            with the full window.
+            Each iteration searches with an aspiration window around the score of the iteration before,
+            widening the window if the score falls outside it; see `aspiration_search`.
+            It also searches the principal variation of the iteration before first, at every node along it.
+            
+            With a `time_manager`, no iteration is started after its soft deadline, and the iteration
+            in progress at its hard deadline is aborted: the best move of the last completed iteration is returned.
+            The first iteration always completes, so there is a move to return.
+            :return: the best move, and its score from White's point of view.
+        """
+        
+        if max_depth is None: max_depth = self.depth + 1
+        length = len(board.move_stack)
+        
+        best_move, score = None, None
+        self.pv, self.pv_moves = [], {}
+        self.clear_move_ordering()
+        for depth in range(1, max_depth + 1):
+            
+            # don't start an iteration that is unlikely to finish in time.
+            if best_move is not None and time_manager is not None and not time_manager.can_deepen():
+                break
+            
+            # search, falling back on the last completed iteration if time runs out.
+            self.time_manager = time_manager if best_move is not None else None
+            try:
+                move, value = self.aspiration_search(board, depth, score)
+            except SearchTimeout:
+                unwind(board, length)
+                if self.debug:
+                    log_debug_info(f"Depth {depth} aborted after {time_manager.elapsed():.2f} seconds; "
+                                   f"playing the best move of depth {depth - 1}.")
+                break
+            finally:
+                self.time_manager = None
+            best_move, score = move, value
+            self.remember_pv(board, best_move, depth)
+            
+            # if debug is enabled, print progress
+            if self.debug:
+                log_debug_info(f"Depth {depth}, best move: {best_move}, score: {score}, "
+                               f"principal variation: {' '.join(str(move) for move in self.pv)}.")
+            
+            # if a checkmate is certain, no need to search deeper.
+            if score in (inf, -inf):
+                break
+        
+        return best_move, (score if board.turn == chess.WHITE else -score)
+    
+    def remember_pv(self, board: Board, best_move: Move, depth: int):
+        """
+            Save the principal variation of a completed iteration: the best move, and the moves expected
+            to follow it, as stored in the transposition table, up to `depth` moves.
+            The next iteration searches them first, even if the table has lost them in the meantime.
+        """
+        
+        self.zobrist.reset(board)
+        self.pv, self.pv_moves = [], {}
+        move = best_move
+        while move is not None and len(self.pv) < depth:
+            key = self.zobrist.key(board)
+            if key in self.pv_moves or not board.is_legal(move):
+                break
+            self.pv.append(move)
+            self.pv_moves[key] = move
+            self.zobrist.push(board, move)
+            
+            entry = self.memory.probe(self.zobrist.key(board)) if self.memory is not None else None
+            move = entry.best_move if entry is not None else None
+        
+        for _ in self.pv:
+            self.zobrist.pop(board)
+    
+    def aspiration_search(self, board: Board, depth: int, guess=None):
+        """
+            Given a board state, searches it `depth` plies deep with a window around `guess`, the expected score.
+            If the score falls outside the window, the window is widened on that side, four times as far
+            each time, and the board searched again. With no guess, the window is infinite.
+            :return: the best move, and its score from the point of view of the player to move.
+        """
+        
+        if guess is None or guess in (inf, -inf):
+            return self.search_root(board, depth, -inf, inf)
+        
+        width = self.aspiration
+        best, worst = guess - width, guess + width
+        while True:
+            best_move, value = self.search_root(board, depth, best, worst)
+            if best < value < worst:
+                return best_move, value
+            
+            # a mate score fails even an infinite window: it is exact, and cannot be widened past.
+            if (value <= best and best == -inf) or (value >= worst and worst == inf):
+                return best_move, value
+            
+            # the score fell outside the window: widen it on the side it failed.
+            width *= 4
+            if value <= best:
+                best = -inf if value == -inf else value - width
+            if value >= worst:
+                worst = inf if value == inf else value + width
+    
+    def search_root(self, board: Board, depth: int, best, worst):
+        """
+            Given a board state, searches its moves `depth` plies deep with PVS, between `best` and `worst`.
+            Moves played before are searched last, so that they are only chosen again if no other move is as good.
+            :return: the best move, and its score from the point of view of the player to move.
+        """
+        
+        self.zobrist.reset(board)
+        self.root_length = len(board.move_stack)
+        key = self.zobrist.key(board)
+        entry = self.memory.probe(key) if self.memory is not None else None
+        tt_move = self.pv_moves.get(key, entry.best_move if entry is not None else None)
+        
+        moves = list(self.search_order(board, tt_move))
+        moves.sort(key=lambda move: str(move) in self.prev_moves)
+        
+        initial_best = best
+        best_move, highest_value = None, -inf
+        for move in moves[:self.move_count] if self.move_count < len(moves) else moves:
+            
+            self.zobrist.push(board, move)
+            value = self.principal_variation(board, depth, best, worst, first=best_move is None)
+            self.zobrist.pop(board)
+            
+            if best_move is None or value > highest_value:
+                best_move, highest_value = move, value
+                
+                # if debug enabled, print progress
+                if self.debug and best < value < worst:
+                    log_debug_info(f"Depth {depth}; better move found: {move}, score = {value}.")
+            
+            best = max(best, value)
+            if best >= worst:
+                break
+        
+        self.remember(key, depth, highest_value, self.bound(highest_value, initial_best, worst), best_move)
+        return best_move, highest_value
+    
+    def principal_variation(self, board: Board, depth: int, best, worst, first: bool):
+        """
+            Given the board state after a move, returns the score of the move, between `best` and `worst`,
+            from the point of view of the player who made it. The first move is searched with the full window;
+            the others with a null window above `best`, and again with the full window if they beat it.
+        """
+        
+        if first or best == -inf:
+            return -self.negamax_value(board, depth - 1, -worst, -best)
+        
+        value = -self.negamax_value(board, depth - 1, -best - self.NULL_WINDOW, -best)
+        if best < value < worst:
+            value = -self.negamax_value(board, depth - 1, -worst, -best)
+        return value
+    
+    def negamax_value(self, board: Board, depth: int, best, worst):
+        """
+            Given a board state, finds its value with PVS, from the point of view of the player to move.
+        """
+        
+        self.nodes += 1
+        if self.time_manager is not None: self.time_manager.check()
+        
+        # if state has been searched deep enough already, get the value from transposition table.
+        # Otherwise, search the move of the principal variation first, if the state is on it,
+        # or else the best move stored.
+        key = self.zobrist.key(board)
+        value, best_move = self.recall(key, depth, best, worst)
+        if value is not None:
+            return value
+        best_move = self.pv_moves.get(key, best_move)
+        
+        # otherwise, if cutoff point has been reached, evaluate the state of the board.
+        if self.cutoff_test(board, depth):
+            value = self.evaluate(board) if board.turn == chess.WHITE else -self.evaluate(board)
+            self.remember(key, depth, value, EXACT)
+            return value
+        
+        # otherwise, search each move in order, the first with the full window and the rest with null windows,
+        # until one scores at least `worst`: the opponent would not allow this state, so the rest are pruned.
+        highest_value = -inf
+        initial_best = best
+        
+        num_moves = self.move_count
+        for move in self.search_order(board, best_move):
+            
+            if num_moves <= 0: break
+            num_moves -= 1
+            
+            self.zobrist.push(board, move)
+            value = self.principal_variation(board, depth, best, worst, first=highest_value == -inf)
+            self.zobrist.pop(board)
+            
+            if value > highest_value:
+                highest_value, best_move = value, move
+            
+            if highest_value >= worst:
+                self.pruned_branches += 1
+                self.record_cutoff(board, move, depth)
+                break
+            
+            else:
+                best = max(best, highest_value)
+        
+        self.remember(key, depth, highest_value, self.bound(highest_value, initial_best, worst), best_move)
+        return highest_value
        
     ###############################################################################
     ################# Added functionality for reordering moves ####################
     ############################################################################### 
-    def reorder_moves(self, board: Board, moves: list, max_heap=True):
+    def search_order(self, board: Board, tt_move: Move = None):
         """
-            Given a board state and a list of legal moves, reorders the moves
-            so that the best move is at the front of the list.
+            Given a board state, generates its legal moves in the order to search them, without making any:
+                1. the best move stored in the transposition table, if any;
+                2. captures, most valuable victim first, then least valuable attacker (MVV-LVA);
+                3. the killer moves of the ply: quiet moves that caused a cutoff in another state at the same ply;
+                4. the other quiet moves, highest history score first, queen promotions before anything else.
+            Each stage is only generated, and sorted, if the search gets to it: a cutoff stops the generator.
+            Quiet moves are kept in a heap, so only the ones searched are taken out in order.
             :arg board: Chess board object.
-            :arg moves: list of legal moves.
+            :arg tt_move: the best move stored for the board state, or None.
         """
         
-        # Initialize Priority Queue
-        ordered_moves = PriorityQueue()
-
-        # For each move, calculate the value of the board *after* the move is made and add it to the queue.
-        for move in moves:
-            ordered_move = OrderedMove(self, board, move, max_heap=max_heap)
-            ordered_moves.push(ordered_move)
-
-        return ordered_moves
+        if tt_move is not None and board.is_legal(tt_move):
+            yield tt_move
+        
+        # captures, by MVV-LVA. An en passant capture takes a pawn.
+        captures = []
+        for move in board.generate_legal_captures():
+            if move != tt_move:
+                victim = board.piece_type_at(move.to_square) or chess.PAWN
+                attacker = board.piece_type_at(move.from_square)
+                captures.append((16 * PIECE_VALUES[victim] - PIECE_VALUES[attacker], move))
+        captures.sort(key=lambda capture: capture[0], reverse=True)
+        for _, move in captures:
+            yield move
+        
+        # killer moves, if they are quiet legal moves here.
+        ply = len(board.move_stack) - self.root_length
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        searched = [tt_move]
+        for move in killers:
+            if move is not None and move not in searched and board.is_legal(move) and not board.is_capture(move):
+                searched.append(move)
+                yield move
+        
+        # quiet moves, by history score. A heap gives them one at a time, without sorting the ones never searched.
+        # Entries are (-score, index, move) tuples: the index breaks ties in generation order.
+        side = 4096 * board.turn
+        history = self.history
+        quiet = []
+        for move in board.generate_legal_moves(chess.BB_ALL, ~board.occupied_co[not board.turn]):
+            if move in searched or board.is_en_passant(move):
+                continue
+            score = history[side + 64 * move.from_square + move.to_square]
+            if move.promotion == chess.QUEEN:
+                score = inf
+            quiet.append((-score, len(quiet), move))
+        heapify(quiet)
+        while quiet:
+            yield heappop(quiet)[2]
+    
+    def record_cutoff(self, board: Board, move: Move, depth: int):
+        """
+            Given a board state searched `depth` plies deep, and the move that caused a cutoff in it,
+            remember the move for ordering: if it is quiet, it becomes the first killer move of the ply,
+            and its history score grows by depth squared, so cutoffs far from the leaves weigh more.
+        """
+        
+        if board.is_capture(move):
+            return
+        
+        ply = len(board.move_stack) - self.root_length
+        while len(self.killers) <= ply:
+            self.killers.append([None, None])
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1], killers[0] = killers[0], move
+        
+        self.history[4096 * board.turn + 64 * move.from_square + move.to_square] += depth * depth
+    
+    def clear_move_ordering(self):
+        """
+            Forget the killer moves, and age the history scores, before searching a new move.
+        """
+        
+        self.killers = []
+        self.history = [score // 8 for score in self.history]
             
 ####################################################################################
 ####################################################################################
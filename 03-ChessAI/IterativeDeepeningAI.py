@@ -15,13 +15,26 @@ import chess                                                # Chess module
 from random import shuffle                                  # functiont to shuffle moves.
 
 from erratum import (log_error, log_info, log_debug_info)   # logging functions. see [../erratum.py] for more info.
+from TimeManager import (TimeManager, SearchTimeout, unwind)  # Time management. see [./TimeManager.py] for more info.
 
 from MinimaxAI import MinimaxAI
 
 class IterativeDeepeningAI():
+    """
+        A Chess AI that deepens a Minimax search iteratively, within a time limit.
+        Deeper searches are started until half of the time has passed, and the search in progress
+        when it runs out is aborted, falling back on the best move of the deepest completed search.
+        Each depth searches the moves in the order of their scores at the depth before, best first.
+    """
     
-    
-    def __init__(self, max_depth, maximizing=True, timeout=30, debug=False):
+    def __init__(self, max_depth, maximizing=True, timeout=10, debug=False):
+        """
+            Constructor.
+            :arg max_depth: the maximum depth to search to.
+            :arg maximizing: whether to maximize or minimize the utility.
+            :arg timeout: the time to choose a move in, in seconds (see [./TimeManager.py]).
+            :arg debug: whether to print debug information.
+        """
         self.maximizing = maximizing
         self.max_depth = max_depth
         self.debug = debug
@@ -34,72 +47,43 @@ class IterativeDeepeningAI():
             Given a board state, chooses the best move to play next.
         """
         
-        # check every move and remember the last move that improves the utility.
-        
+        # start the clock.
+        time_manager = TimeManager(self.timeout)
+        length = len(board.move_stack)
         
         best_move, best_cost = None, -inf
-        counter = self.timeout
-        
+        moves: list = list(board.legal_moves)
     
         # iterate over allowed depths.
         for depth in range(1, self.max_depth):
             
-            if best_move:
-                board.push(best_move)
-                new_cost = self.search_engine.minimax(board, depth=depth)
-                board.pop()
-                
-                # First, recheck the best move from previous depth and update cost if it changes.
-                if new_cost < best_cost:
-                    if self.debug:
-                        log_error(f"Move with best score changed score from {best_cost} to {new_cost}.")
-                    best_cost = new_cost
+            # don't start a depth that is unlikely to finish in time.
+            # The first depth always runs to completion, so there is a move to fall back on.
+            if best_move is not None and not time_manager.can_deepen():
+                break
             
-            # get every possible move and explore it to the current depth.
-            for move in board.legal_moves:
-                
-                # try the move
-                board.push(move)
-                
-                # get the utility of the board after the move.
-                cost = self.search_engine.minimax(board, depth=depth)
-                
-                # check if the move improves the utility.
-                # NOTE: we check whether it *matches* the utility, OR if it *betters* the utility.
-                # This helps avoid a repetition loop where a sequence of first-occurring moves loop back
-                # to each other and the game gets stuck in a loop. 
-                # However, we also need to avoid blindly chosing the last move played -- 
-                # so we check if the state of the board after the move has been recorded before
-                # in the prev_moves set.
-                if ( (self.maximizing) and (cost >= best_cost) ) \
-                    or ( (not self.maximizing) and (cost <= best_cost) ):
-                        
-                    # if the cost strictly improves the utility, remember it and log progress.
-                    if cost != best_cost:
-                        
-                        # if debug enabled, print progress
-                        if self.debug:
-                            if not (best_cost == -inf or best_cost == inf):
-                                log_debug_info(f"Depth {depth}; better move found, score shift from {best_cost} to {cost}.")
-                            else:
-                                log_debug_info(f"First move found at depth {depth}; score = {cost}.")
-                        
-                        best_move, best_cost = move, cost
-                        
-                    elif not ((cost == best_cost) and (str(move) in self.prev_moves)):
-                        # log_error(f"Depth {depth}; move {move} has same score as previous move {best_move}.")
-                        best_move, best_cost = move, cost
-                        
-                
-                # undo the move
-                board.pop()
-                
-                # if the timeout is reached, stop searching other moves. Otherwise, decrement the timeout.
-                if counter <= 0: break
-                else: counter -= 1
-                
-            if counter <= 0:
+            # search every move to the current depth, falling back on the last completed depth if time runs out.
+            self.search_engine.time_manager = time_manager if best_move is not None else None
+            try:
+                move, cost, scores = self.search_moves(board, moves, depth)
+            except SearchTimeout:
+                unwind(board, length)
+                if self.debug:
+                    log_debug_info(f"Depth {depth} aborted after {time_manager.elapsed():.2f} seconds; "
+                                   f"playing the best move of depth {depth - 1}.")
                 break
+            finally:
+                self.search_engine.time_manager = None
+            
+            # if the best move changed score, log it.
+            if self.debug and move == best_move and cost != best_cost:
+                log_error(f"Move with best score changed score from {best_cost} to {cost}.")
+            best_move, best_cost = move, cost
+            
+            # search the best move first at the next depth, then the others, from best to worst.
+            moves.sort(key=lambda move: scores[move], reverse=self.maximizing)
+            moves.remove(best_move)
+            moves.insert(0, best_move)
             
             # if debug is enabled, print progress
             if self.debug:
@@ -107,10 +91,62 @@ class IterativeDeepeningAI():
          
         
         # once the best move is found, remember it and return it.
-        self.prev_moves.add(str(move))
+        self.prev_moves.add(str(best_move))
         
         # print information on chosen best move.
         log_info(f"Iterative Deepening AI recommends move {best_move} with cost {best_cost}")
         
         # return chosen move.
-        return best_move
\ No newline at end of file
+        return best_move
+    
+    def search_moves(self, board: Board, moves: list, depth: int):
+        """
+            Given a board state and its legal moves, searches every move `depth` plies deep (after the move).
+            :return: the best move, its cost, and a dictionary mapping every move to its cost.
+        """
+        
+        best_move = None
+        best_cost = -inf if self.maximizing else inf
+        scores = {}
+        
+        # get every possible move and explore it to the current depth.
+        for move in moves:
+            
+            # try the move
+            board.push(move)
+            
+            # get the utility of the board after the move.
+            cost = self.search_engine.minimax(board, depth=depth)
+            scores[move] = cost
+            
+            # check if the move improves the utility.
+            # NOTE: we check whether it *matches* the utility, OR if it *betters* the utility.
+            # This helps avoid a repetition loop where a sequence of first-occurring moves loop back
+            # to each other and the game gets stuck in a loop. 
+            # However, we also need to avoid blindly chosing the last move played -- 
+            # so we check if the state of the board after the move has been recorded before
+            # in the prev_moves set.
+            if ( (self.maximizing) and (cost >= best_cost) ) \
+                or ( (not self.maximizing) and (cost <= best_cost) ):
+                    
+                # if the cost strictly improves the utility, remember it and log progress.
+                if cost != best_cost:
+                    
+                    # if debug enabled, print progress
+                    if self.debug:
+                        if not (best_cost == -inf or best_cost == inf):
+                            log_debug_info(f"Depth {depth}; better move found, score shift from {best_cost} to {cost}.")
+                        else:
+                            log_debug_info(f"First move found at depth {depth}; score = {cost}.")
+                    
+                    best_move, best_cost = move, cost
+                    
+                elif not ((cost == best_cost) and (str(move) in self.prev_moves)):
+                    # log_error(f"Depth {depth}; move {move} has same score as previous move {best_move}.")
+                    best_move, best_cost = move, cost
+                    
+            
+            # undo the move
+            board.pop()
+        
+        return best_move, best_cost, scores
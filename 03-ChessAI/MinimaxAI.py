@@ -38,6 +38,9 @@ class MinimaxAI():
         self.debug: bool = debug
         self.nodes_visited = 0
         self.prev_moves = set()
+        
+        # the time manager of the search in progress, if it is timed (see [./TimeManager.py]).
+        self.time_manager = None
 
     def choose_move(self, board: Board):
         """
@@ -127,6 +130,8 @@ class MinimaxAI():
         """
             Given a board state, finds the maximum value for that state.
         """
+        
+        if self.time_manager is not None: self.time_manager.check()
             
         # if cutoff point has been reached, evaluate the value of the board.
         if self.cutoff_test(board, depth):
@@ -150,6 +155,8 @@ class MinimaxAI():
         """
             Given a board state, finds the minimum value for that state.
         """
+        
+        if self.time_manager is not None: self.time_manager.check()
             
         # otherwise, if cutoff point has been reached, evaluate the value of the board.
         if self.cutoff_test(board, depth):
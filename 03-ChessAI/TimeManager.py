@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+    This module implements a wall-clock time manager for iterative deepening searches.
+
+    Each iteration of an iterative deepening search takes several times as long as the one before,
+    so an iteration started late is unlikely to finish. The time manager keeps two deadlines:
+        soft deadline: no new iteration is started after it.
+        hard deadline: the iteration in progress is aborted, and the player falls back
+            on the best move of the last iteration that completed.
+    Searches call `check` as they go; it raises `SearchTimeout` once the hard deadline has passed.
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+from time import perf_counter
+
+from chess import Board
+
+
+class SearchTimeout(Exception):
+    """
+        Raised by `TimeManager.check` to abort a search once its hard deadline has passed.
+    """
+    pass
+
+
+class TimeManager(object):
+    """
+        A time budget for choosing one move, starting when the TimeManager is created.
+    """
+    def __init__(self, time_limit, soft_limit=0.5):
+        """
+            Constructor.
+            :arg `time_limit`: the time to choose a move in, in seconds: the hard deadline.
+            :arg `soft_limit` [optional]: the fraction of the time limit after which no new iteration is started.
+        """
+        self.time_limit = time_limit
+        self.soft_limit = soft_limit
+        self.start_time = perf_counter()
+        self.soft_deadline = self.start_time + soft_limit * time_limit
+        self.hard_deadline = self.start_time + time_limit
+
+    def elapsed(self):
+        """Return the time since the TimeManager was created, in seconds.
+        """
+        return perf_counter() - self.start_time
+
+    def can_deepen(self):
+        """Check whether there is time to start a new iteration.
+        """
+        return perf_counter() < self.soft_deadline
+
+    def check(self):
+        """Abort the search, by raising SearchTimeout, if the hard deadline has passed.
+        """
+        if perf_counter() >= self.hard_deadline:
+            raise SearchTimeout(f"Search aborted after {self.elapsed():.2f} seconds.")
+
+
+def unwind(board: Board, length: int):
+    """
+        Pop the moves an aborted search left on a board, until its move stack has `length` moves again.
+    """
+    while len(board.move_stack) > length:
+        board.pop()
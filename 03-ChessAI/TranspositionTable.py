@@ -2,7 +2,22 @@
 # -*- coding: utf-8 -*-
 
 """
-    This module implements a Transposition Table.
+    This module implements a Transposition Table, keyed by the Zobrist hash of a board.
+
+    A Zobrist hash XORs one random 64-bit number for every (piece, square) pair on the board,
+    plus numbers for the side to move, the castling rights and the en passant file.
+    We use python-chess's polyglot numbers, so keys match `chess.polyglot.zobrist_hash`.
+    Since XOR is its own inverse, a move changes the key by XORing out the pieces it moves or captures
+    and XORing them back in on their new squares: `ZobristHash` keeps the key up to date as moves
+    are pushed and popped, in a handful of operations, instead of hashing the whole board every time.
+
+    Every entry records the search that produced it: its depth, its score, the best move found,
+    and whether the score is exact or only a bound. A search that fails high (score >= beta)
+    stops early, so its score is only a LOWER bound on the true score; one that fails low
+    (score <= alpha) only proves an UPPER bound.
+
+    The table has a fixed size, set in megabytes, so it can be kept for a whole game:
+    when it fills up, new entries replace the least useful old ones (see `TranspositionTable`).
 """
 __author__ = "Amittai"
 __copyright__ = "Copyright 2021"
@@ -10,44 +25,290 @@ __credits__ = ["Amittai"]
 __email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
 __github__ = "@siavava"
 
+from array import array
+from collections import namedtuple
+
+import chess
 from chess import Board, Move
+from chess.polyglot import POLYGLOT_RANDOM_ARRAY, ZobristHasher
+
+# bound types of a stored score.
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# the polyglot numbers for every piece on every square, indexed by [color][piece type][square],
+# the side to move, and the castling rights, by the rook square they refer to.
+_PIECE_KEYS = [[None] + [[POLYGLOT_RANDOM_ARRAY[64 * (2 * (piece_type - 1) + color) + square]
+                          for square in chess.SQUARES]
+                         for piece_type in chess.PIECE_TYPES]
+               for color in (chess.BLACK, chess.WHITE)]
+_TURN_KEY = POLYGLOT_RANDOM_ARRAY[780]
+_CASTLING_KEYS = ((chess.BB_H1, POLYGLOT_RANDOM_ARRAY[768]), (chess.BB_A1, POLYGLOT_RANDOM_ARRAY[769]),
+                  (chess.BB_H8, POLYGLOT_RANDOM_ARRAY[770]), (chess.BB_A8, POLYGLOT_RANDOM_ARRAY[771]))
+_HASHER = ZobristHasher(POLYGLOT_RANDOM_ARRAY)
+
+
+def board_key(board: Board):
+    """Return the part of a board's Zobrist hash that moves update incrementally:
+        the pieces on the board and the side to move.
+    """
+    return _HASHER.hash_board(board) ^ _HASHER.hash_turn(board)
+
+
+def position_key(board: Board, key):
+    """Return the full Zobrist hash of a board, given its `board_key`:
+        the castling rights and en passant file are hashed in from the board itself.
+    """
+    rights = board.castling_rights
+    if rights:
+        for rook_square, castling_key in _CASTLING_KEYS:
+            if rights & rook_square:
+                key ^= castling_key
+    if board.ep_square is not None:
+        key ^= _HASHER.hash_ep_square(board)
+    return key
+
+
+def zobrist_key(board: Board):
+    """Return the Zobrist hash of a board, computed from scratch.
+    """
+    return position_key(board, board_key(board))
+
+
+def move_key(board: Board, key, move: Move):
+    """Given the `board_key` of a board, return the `board_key` of the board after a move.
+        Must be called *before* the move is pushed.
+    """
+    from_square, to_square = move.from_square, move.to_square
+    color = board.turn
+    piece_type = board.piece_type_at(from_square)
+    keys = _PIECE_KEYS[color]
+    key ^= keys[piece_type][from_square] ^ _TURN_KEY
+
+    # castling moves the king two squares, and the rook over it.
+    if piece_type == chess.KING and board.is_castling(move):
+        if to_square > from_square:
+            rook_from, rook_to = to_square + 1, to_square - 1
+        else:
+            rook_from, rook_to = to_square - 2, to_square + 1
+        return key ^ keys[chess.KING][to_square] ^ keys[chess.ROOK][rook_from] ^ keys[chess.ROOK][rook_to]
+
+    # remove the captured piece, if any: an en passant capture takes the pawn behind the target square.
+    captured = board.piece_type_at(to_square)
+    if captured:
+        key ^= _PIECE_KEYS[not color][captured][to_square]
+    elif piece_type == chess.PAWN and to_square == board.ep_square:
+        key ^= _PIECE_KEYS[not color][chess.PAWN][to_square - 8 if color else to_square + 8]
+
+    return key ^ keys[move.promotion or piece_type][to_square]
+
+
+class ZobristHash(object):
+    """
+        Tracks the Zobrist hash of a board while a search pushes and pops moves on it.
+        Moves must go through `push` and `pop` for the key to stay in sync with the board.
+    """
+    def __init__(self, board: Board = None):
+        self.keys = []
+        if board is not None:
+            self.reset(board)
+
+    def reset(self, board: Board):
+        """Hash a board from scratch, forgetting the moves pushed so far.
+        """
+        self.keys = [board_key(board)]
+
+    def push(self, board: Board, move: Move):
+        self.keys.append(move_key(board, self.keys[-1], move))
+        board.push(move)
+
+    def pop(self, board: Board):
+        self.keys.pop()
+        return board.pop()
+
+    def key(self, board: Board):
+        """Return the Zobrist hash of the board.
+        """
+        return position_key(board, self.keys[-1])
+
+
+def _encode_move(move: Move):
+    """Pack a move into 16 bits: from square, to square and promotion piece type, 6 + 6 + 4 bits. None packs to 0.
+    """
+    if move is None:
+        return 0
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def _decode_move(code):
+    """Unpack a move packed by `_encode_move`.
+    """
+    if code == 0:
+        return None
+    return Move(code & 63, (code >> 6) & 63, (code >> 12) or None)
+
+
+class TTEntry(namedtuple("TTEntry", ["depth", "score", "bound", "best_move"])):
+    """
+        A transposition table entry: the result of a search `depth` plies deep,
+        with the type of bound its score is, and the best move found (None at leaves).
+    """
+    __slots__ = ()
+
+    def cutoff(self, depth, alpha, beta):
+        """Check whether the entry settles a search `depth` plies deep with the window (alpha, beta).
+            :return: the score to return for the search, or None if the position must be searched.
+        """
+        if self.depth < depth:
+            return None
+        if self.bound == EXACT \
+                or (self.bound == LOWER and self.score >= beta) \
+                or (self.bound == UPPER and self.score <= alpha):
+            return self.score
+        return None
+
 
 class TranspositionTable(object):
-    def __init__(self):
-        self.data: dict = {}
+    """
+        A fixed-size table of search results, keyed by Zobrist hash.
+
+        The table takes `size_mb` megabytes, allocated up front in flat `array` buffers,
+        one per entry field, and never grows: memory use stays the same over a whole game.
+        Slots are grouped in buckets of `bucket_size`; a key can only be stored in the bucket picked
+        by its low bits, so a full bucket must give up one of its entries for a new key (a collision).
+        The entry given up is the least useful one: an entry left over from an earlier search
+        (see `new_search`) first, then the shallowest. `replacement` decides when it is given up:
+            "two_tier" [default]: the last slot of each bucket always takes the new entry;
+                the others only give up entries searched no deeper than the new one.
+                Deep results survive, and recent shallow ones still have somewhere to go.
+            "depth": an entry is only given up for one searched at least as deep; others are dropped.
+            "always": the new entry always replaces one.
+        Whatever the policy, a deeper result for a position is never replaced by a shallower one
+        from the same search.
+    """
+    REPLACEMENT = ("two_tier", "depth", "always")
+
+    # bytes per slot: key, score, depth, best move, bound, search generation.
+    SLOT_SIZE = 8 + 8 + 2 + 2 + 1 + 1
+
+    def __init__(self, size_mb=16, bucket_size=2, replacement="two_tier"):
+        if replacement not in self.REPLACEMENT:
+            raise ValueError(f"Unknown replacement policy {replacement!r}; expected one of {self.REPLACEMENT}.")
+        if replacement == "two_tier" and bucket_size < 2:
+            raise ValueError("Two-tier replacement needs buckets of at least two slots.")
+        self.replacement = replacement
+        self.bucket_size = bucket_size
+
+        # the number of buckets is the largest power of two that fits, so a bucket is picked by masking the key.
+        num_buckets = 1
+        while 2 * num_buckets * bucket_size * self.SLOT_SIZE <= size_mb * 2 ** 20:
+            num_buckets *= 2
+        self.mask = num_buckets - 1
+        self.capacity = num_buckets * bucket_size
+
+        # slot fields. A depth of -1 marks an empty slot.
+        self.keys = array("Q", bytes(8 * self.capacity))
+        self.scores = array("d", bytes(8 * self.capacity))
+        self.depths = array("h", [-1]) * self.capacity
+        self.moves = array("H", bytes(2 * self.capacity))
+        self.bounds = array("B", bytes(self.capacity))
+        self.generations = array("B", bytes(self.capacity))
+
+        self.generation = 0
         self.len = 0
-        
-    def __bool__(self):
-        return self.len != 0
-        
-    def __getitem__(self, key):
-        return self.data.get(str(key), None)
-    
+
+        # variables to track performance
+        self.hits: int = 0
+        self.misses: int = 0
+        self.collisions: int = 0
+
+    def new_search(self):
+        """Start a new search: entries stored so far can still be probed, but are the first to be replaced.
+        """
+        self.generation = (self.generation + 1) % 256
+
+    def _find(self, key):
+        """Return the slot holding a key, or -1.
+        """
+        start = (key & self.mask) * self.bucket_size
+        keys, depths = self.keys, self.depths
+        for slot in range(start, start + self.bucket_size):
+            if keys[slot] == key and depths[slot] >= 0:
+                return slot
+        return -1
+
     def __contains__(self, key):
         """Check if the table contains an item.
         """
-        if str(key) in self.data:
-            return True
-        
-        return False
-    
-    def __setitem__(self, key, value):
-        self.data[str(key)] = value
-        self.len += 1
-       
+        return self._find(key) >= 0
+
+    def probe(self, key):
+        """Return the entry stored for a key, or None.
+        """
+        slot = self._find(key)
+        if slot < 0:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return TTEntry(self.depths[slot], self.scores[slot], self.bounds[slot], _decode_move(self.moves[slot]))
+
+    def store(self, key, depth, score, bound, best_move=None):
+        """Store the result of a search, as the replacement policy allows.
+            A search that found no best move keeps the one stored before, for move ordering.
+        """
+        depths, generations = self.depths, self.generations
+        slot = self._find(key)
+
+        # the same position: keep a deeper result from this search.
+        if slot >= 0:
+            if depths[slot] > depth and generations[slot] == self.generation:
+                return
+            if best_move is None:
+                best_move = _decode_move(self.moves[slot])
+
+        # a new position: take an empty slot, or give up the least useful entry of the bucket.
+        else:
+            start = (key & self.mask) * self.bucket_size
+            end = start + self.bucket_size - (self.replacement == "two_tier")
+            slot = min(range(start, end), key=lambda slot: (depths[slot] >= 0,
+                                                             generations[slot] == self.generation,
+                                                             depths[slot]))
+            if depths[slot] < 0:
+                self.len += 1
+            else:
+                if self.replacement != "always" and generations[slot] == self.generation and depths[slot] > depth:
+                    if self.replacement == "depth":
+                        return
+                    slot = end
+                    if depths[slot] < 0:
+                        self.len += 1
+                        self._write(slot, key, depth, score, bound, best_move)
+                        return
+                self.collisions += 1
+
+        self._write(slot, key, depth, score, bound, best_move)
+
+    def _write(self, slot, key, depth, score, bound, best_move):
+        self.keys[slot] = key
+        self.depths[slot] = depth
+        self.scores[slot] = score
+        self.bounds[slot] = bound
+        self.moves[slot] = _encode_move(best_move)
+        self.generations[slot] = self.generation
+
+    def clear(self):
+        """Empty the table, keeping its memory.
+        """
+        self.depths[:] = array("h", [-1]) * self.capacity
+        self.len = 0
+        self.hits = self.misses = self.collisions = 0
+
     def __str__(self):
-        return str(self.data)
-    
+        probes = self.hits + self.misses
+        hit_rate = self.hits / probes if probes else 0
+        return f"{self.len}/{self.capacity} entries, {self.hits} hits ({hit_rate:.1%}), " \
+               f"{self.misses} misses, {self.collisions} collisions"
+
     def __len__(self):
+        """Return the number of positions in the table.
+        """
         return self.len
-    
-    # def zobrist_hash(self, board: Board):
-    #     """Return the Zobrist hash of a board.
-    #     """
-    #     hash_value = 0
-    #     for square in range(64):
-    #         piece = board.piece_at(square)
-    #         if piece:
-    #             hash_value ^= self.zobrist_piece_table[piece.piece_type][square]
-    
-    
\ No newline at end of file
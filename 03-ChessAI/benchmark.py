@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""This file benchmarks the searches of `EnhancedAlphaBetaAI`.
+
+    Run it to compare the number of nodes searched, at a given depth, by the full-window Alpha-Beta search
+    (every root move searched on its own, with an infinite window) against Principal Variation Search
+    with aspiration windows, on a few positions, e.g. `python benchmark.py --depth 3 --csv results.csv`.
+"""
+__author__ = "Amittai"
+__copyright__ = "Copyright 2021"
+__credits__ = ["Amittai"]
+__email__ = "Amittai.J.Wekesa.24@dartmouth.edu"
+__github__ = "@siavava"
+
+import csv
+import io
+from argparse import ArgumentParser
+from contextlib import redirect_stdout
+from time import perf_counter
+
+from chess import Board, STARTING_FEN
+
+from EnhancedAlphaBetaAI import EnhancedAlphaBetaAI
+
+# the positions to search, by name.
+POSITIONS = {
+    "opening": STARTING_FEN,
+    "middlegame": "r3kb1r/p2p3p/1p4pn/1P2P1q1/2P1b3/NPQ5/5PPP/R3KB1R w KQkq - 0 1",
+    "knight fork": "r4r2/pb1pk2p/1p4p1/1P6/2PR4/1P3n2/4BP1P/3K4 b - - 0 1",
+    "endgame": "r4r2/p6p/1p4p1/1Pk5/b4P2/R7/7P/2K5 w - - 0 1",
+    # black mates: the mate score falls outside every aspiration window.
+    "mate": "r1bk1br1/1pp1p1pQ/6Pn/p4p2/2n5/NPPqP2P/PB2NR2/R1K2B2 b - - 2 19",
+}
+
+# the searches to compare, by name, with the arguments that select them.
+SEARCHES = {
+    "alpha-beta": {"pvs": False},
+    "pvs": {"pvs": True},
+}
+
+# columns of the benchmark results, in order.
+FIELDS = ["position", "search", "depth", "seconds", "nodes", "move", "score"]
+
+
+def run_benchmarks(positions=POSITIONS, searches=SEARCHES, depth=2, memoized=True):
+    """Choose a move with every search in every position.
+        :arg positions: a dictionary mapping names to FEN strings.
+        :arg searches: a dictionary mapping names to keyword arguments of `EnhancedAlphaBetaAI`.
+        :arg depth: the search depth, as passed to `EnhancedAlphaBetaAI`.
+        :arg memoized: whether the searches use a transposition table.
+        :return: a list of result rows, each a dictionary keyed by the names in FIELDS.
+    """
+    rows = []
+    for name, fen in positions.items():
+        for search, kwargs in searches.items():
+            board = Board(fen)
+            player = EnhancedAlphaBetaAI(depth, maximizing=board.turn, memoized=memoized, **kwargs)
+
+            # the players log every move they choose; keep the results table readable.
+            start_time = perf_counter()
+            with redirect_stdout(io.StringIO()):
+                move = player.choose_move(board)
+            seconds = perf_counter() - start_time
+
+            # score the move chosen with the same (full-window) search, so scores are comparable.
+            board.push(move)
+            score = EnhancedAlphaBetaAI(depth, memoized=False, pvs=False).alpha_beta_search(board)
+            rows.append({
+                "position": name,
+                "search": search,
+                "depth": depth,
+                "seconds": seconds,
+                "nodes": player.nodes,
+                "move": str(move),
+                "score": score,
+            })
+    return rows
+
+
+def write_csv(rows, filename):
+    """Write benchmark results to a CSV file, one row per (position, search) run.
+    """
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_rows(rows):
+    """Print benchmark results as a table.
+    """
+    print("{:<12s} {:<11s} {:>5s} {:>9s} {:>9s} {:>6s} {:>6s}".format(
+        "position", "search", "depth", "seconds", "nodes", "move", "score"))
+    for row in rows:
+        print("{:<12s} {:<11s} {:>5d} {:>9.4f} {:>9d} {:>6s} {:>6}".format(
+            row["position"], row["search"], row["depth"], row["seconds"],
+            row["nodes"], row["move"], row["score"]))
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="Compare full-window Alpha-Beta against Principal Variation Search.")
+    parser.add_argument("--depth", type=int, default=2, help="search depth (default: 2)")
+    parser.add_argument("--csv", help="file to write results to, as CSV")
+    parser.add_argument("--no-memo", action="store_true", help="search without a transposition table")
+    args = parser.parse_args()
+
+    results = run_benchmarks(depth=args.depth, memoized=not args.no_memo)
+    print_rows(results)
+    if args.csv:
+        write_csv(results, args.csv)
@@ -36,17 +36,17 @@ def main():
     alpha_beta_white = AlphaBetaAI(3, debug=True)
     alpha_beta_black = AlphaBetaAI(3, maximizing=False, debug=True)
 
-    # toggle timeout to limit search operations.
-    ids_white = IterativeDeepeningAI(7, timeout=50, debug=True)
-    ids_black = IterativeDeepeningAI(7, timeout=30, maximizing=False, debug=True)
+    # toggle timeout to limit the time to choose a move in, in seconds.
+    ids_white = IterativeDeepeningAI(7, timeout=10, debug=True)
+    ids_black = IterativeDeepeningAI(7, timeout=5, maximizing=False, debug=True)
 
     # toggle memoized to True to use Transposition Table, 
     # vary move_count to change number of best moves that are considered
     enhanced_alpha_beta_white = EnhancedAlphaBetaAI(5, move_count=4, memoized=False, debug=True)
     enhanced_alpha_beta_black = EnhancedAlphaBetaAI(5, maximizing=False, debug=True)
 
-    better_ai_white = BetterAI(timeout=100, debug=True)
-    better_ai_black = BetterAI(timeout=30, maximizing=False, debug=True)
+    better_ai_white = BetterAI(timeout=10, debug=True)
+    better_ai_black = BetterAI(timeout=5, maximizing=False, debug=True)
 
 
 
@@ -82,6 +82,10 @@ def main():
     # enhanced_alpha_beta_white = EnhancedAlphaBetaAI(4, move_count=5, memoized=True, debug=True)
     # game = ChessGame(enhanced_alpha_beta_white, random_player)
 
+    ## Tests for Principal Variation Search: set pvs=False to search every root move with a full window instead.
+    # enhanced_alpha_beta_white = EnhancedAlphaBetaAI(4, pvs=False, debug=True)
+    # game = ChessGame(enhanced_alpha_beta_white, random_player)
+
     # start time tracker
     pr = cProfile.Profile()
     pr.enable()